@@ -1,10 +1,24 @@
-from flask import Flask, render_template, request, flash, redirect, session, send_file, url_for
-import pandas as pd
-from io import BytesIO
-import json
+from flask import (Flask, Response, render_template, request, flash, redirect, session, send_file, stream_with_context,
+                   url_for, jsonify)
+from dataclasses import asdict
 from datetime import datetime
-from collections import defaultdict
+from dashboard_stats import (DEFAULT_PER_PAGE, HARD_CONSTRAINTS, SEVERE_CONSTRAINTS, build_aggregates, filter_rows,
+                             paginate)
+from ga_config import GAConfig
+from ga_metrics import MetricsRecorder, ProfilerObserver
+from input_loader import InputCache, InputError, load_inputs
 from ga_model import initialize_population, calculate_fitness, genetic_algorithm, check_constraints
+from jobs import JobQueue
+from parallel_ga import parallel_genetic_algorithm
+from problem_model import compile_problem
+from replan import changed_exams, replan
+from result_cache import EliteRecorder, ResultCache, input_key, run_key
+from result_store import ResultStore
+from seeding import as_rng
+from solvers import SOLVERS, solve
+from timetable_export import (FORMATS as EXPORT_FORMATS, MIMETYPES as EXPORT_MIMETYPES, export_file, format_schedule,
+                              iter_csv)
+from venues import DEFAULT_VENUES, load_venues
 import os
 from werkzeug.utils import secure_filename
 
@@ -13,16 +27,58 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secure-secret-key-here'  # Change this in production
 app.config['UPLOAD_FOLDER'] = 'uploads/'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['GA_ISLANDS'] = int(os.environ.get('GA_ISLANDS', 1))  # >1 runs the island-model GA on a process pool
+# Default GA settings; uploads may override the GA_REQUEST_SETTINGS fields per request
+app.config['GA_CONFIG'] = GAConfig(
+    population_size=100, num_generations=30, elite_size=20, tournament_size=3, patience=10, mutation_rate=0.1,
+    repair_budget=float(os.environ.get('GA_REPAIR_BUDGET', 0.1)),  # local-search seconds per generation
+)
+app.config['GA_REQUEST_SETTINGS'] = ('population_size', 'num_generations', 'patience', 'time_budget', 'crossover',
+                                     'mutation', 'mutation_rate', 'adaptive_mutation')
+# Largest values a request may ask for, so one upload cannot hold a job worker indefinitely
+app.config['GA_REQUEST_LIMITS'] = {'population_size': 500, 'num_generations': 200, 'patience': 200,
+                                   'time_budget': 600}
+app.config['SOLVER_ENGINE'] = os.environ.get('SOLVER_ENGINE', 'ga')  # default engine; see solvers.SOLVERS
+# Exam halls and capacities; VENUES_FILE names a JSON venue table (see venues.load_venues)
+app.config['VENUES'] = load_venues(os.environ['VENUES_FILE']) if os.environ.get('VENUES_FILE') else DEFAULT_VENUES
+app.config['JOB_DATABASE'] = os.path.join(app.config['UPLOAD_FOLDER'], 'jobs.sqlite3')
+app.config['JOB_WORKERS'] = 2
+app.config['RESULT_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'results')
+app.config['RESULT_CACHE_SIZE'] = 32
+app.config['INPUT_CACHE_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'inputs')
+app.config['RESULT_MEMO_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'memo')
+app.config['RESULT_MEMO_MAX_BYTES'] = 64 * 1024 * 1024
+app.config['RESULT_MEMO_ELITES'] = 10  # best genomes kept per input set for warm starts
+app.config['REPLAN_TIME_BUDGET'] = 30  # seconds
+app.config['GA_METRICS_FOLDER'] = os.environ.get('GA_METRICS_FOLDER')  # per-generation JSON/CSV traces when set
+app.config['GA_PROFILE'] = os.environ.get('GA_PROFILE') == '1'  # cProfile dump next to the traces
 
 # Ensure upload folder exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Background timetable generation
+job_queue = JobQueue(app.config['JOB_DATABASE'], max_workers=app.config['JOB_WORKERS'])
+
+# Generated timetables, kept server-side and looked up by ID
+result_store = ResultStore(app.config['RESULT_FOLDER'], cache_size=app.config['RESULT_CACHE_SIZE'])
+
+# Cleaned upload DataFrames keyed by file content hash
+input_cache = InputCache(app.config['INPUT_CACHE_FOLDER'])
+
+# Finished runs keyed by inputs, GA parameters and seed, plus elites for warm starts
+result_cache = ResultCache(app.config['RESULT_MEMO_FOLDER'], max_bytes=app.config['RESULT_MEMO_MAX_BYTES'])
+
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'xlsx', 'xls'}
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+@app.context_processor
+def constraint_severity():
+    """Constraint severities for the violation badges on every page."""
+    return {'severe_constraints': SEVERE_CONSTRAINTS, 'hard_constraints': HARD_CONSTRAINTS}
+
 @app.route('/')
 def index():
     """Render the main page."""
@@ -47,85 +103,59 @@ def upload_files():
                 flash("Invalid file type. Please upload Excel files only.", "error")
                 return redirect(url_for('index'))
 
-        # Load and validate exam data
+        # Parse each workbook once; unchanged re-uploads come from the input cache
         try:
-            data_exam = pd.read_excel(data_exam_file, header=0)
-            data_exam.columns = [
-                'Tarikh', 'Hari', 'Waktu', 'Kod Kursus', 'Kod Setara', 
-                'Masa Mula', 'Masa Tamat', 'Jumlah Pelajar'
-            ]
-        except Exception as e:
-            flash("Error reading exam data file. Please check the format.", "error")
+            data_exam, data_invigilator, contoh_jadual = load_inputs(
+                data_exam_file.read(), data_invigilator_file.read(), contoh_jadual_file.read(), cache=input_cache
+            )
+        except InputError as e:
+            flash(str(e), "error")
             return redirect(url_for('index'))
 
-        # Load and validate invigilator data
+        # Optional run settings
         try:
-            invigilator_sheets = pd.ExcelFile(data_invigilator_file).sheet_names
-            required_sheets = ['STAFF(S)', 'LECTERUR(L & K)']
-            
-            if not all(sheet in invigilator_sheets for sheet in required_sheets):
-                flash("Missing required worksheets in invigilator file.", "error")
-                return redirect(url_for('index'))
-
-            staff_df = pd.read_excel(data_invigilator_file, sheet_name='STAFF(S)')
-            lecturer_df = pd.read_excel(data_invigilator_file, sheet_name='LECTERUR(L & K)')
-            
-            staff_df.columns = ['Bil', 'No. Pekerja', 'Nama', 'Jawatan', 'Jantina']
-            lecturer_df.columns = ['Bil', 'No. Pekerja', 'Nama', 'Jawatan', 'Jantina']
-        except Exception as e:
-            flash("Error reading invigilator data file. Please check the format.", "error")
+            seed = int(request.form['seed']) if request.form.get('seed', '').strip() else None
+        except ValueError:
+            flash("Seed must be a whole number.", "error")
             return redirect(url_for('index'))
-
-        # Load and validate sample schedule
         try:
-            contoh_jadual = pd.read_excel(contoh_jadual_file, header=0)
-            if len(contoh_jadual.columns) == 10:
-                contoh_jadual.columns = [
-                    'Tarikh', 'Masa', 'Kod Kursus', 'Kod Program', 'Kumpulan', 
-                    'Bilangan Calon', 'Pensyarah', 'Tempat', 'Pengawas', 'Unused'
-                ]
-            else:
-                flash("Invalid sample schedule format.", "error")
-                return redirect(url_for('index'))
-        except Exception as e:
-            flash("Error reading sample schedule file. Please check the format.", "error")
+            config = GAConfig.from_mapping(
+                {name: request.form[name] for name in app.config['GA_REQUEST_SETTINGS'] if name in request.form},
+                base=app.config['GA_CONFIG'], limits=app.config['GA_REQUEST_LIMITS']
+            )
+        except ValueError as e:
+            flash(f"Invalid GA setting: {e}", "error")
+            return redirect(url_for('index'))
+        engine = request.form.get('engine') or app.config['SOLVER_ENGINE']
+        if engine not in SOLVERS:
+            flash(f"Unknown solver: {engine}", "error")
+            return redirect(url_for('index'))
+        warm_start = request.form.get('warm_start') == 'on'
+        regenerate = request.form.get('regenerate') == 'on'
+        base_result_id = request.form.get('base_result_id') or session.get('result_id')
+        if request.form.get('replan') == 'on' and result_store.load(base_result_id) is None:
+            flash("There is no current timetable to re-plan; generate one first.", "error")
             return redirect(url_for('index'))
 
         # Process data and generate timetable
         try:
-            # Clean exam data
-            data_exam['Tarikh'] = pd.to_datetime(data_exam['Tarikh'], errors='coerce')
-            data_exam.dropna(subset=['Tarikh', 'Kod Kursus'], inplace=True)
-
-            # Clean sample schedule
-            contoh_jadual.drop(columns=['Pengawas', 'Unused'], inplace=True, errors='ignore')
-            contoh_jadual['Tarikh'] = pd.to_datetime(contoh_jadual['Tarikh'], errors='coerce')
-            contoh_jadual.dropna(subset=['Tarikh', 'Kod Kursus'], inplace=True)
-
-            # Combine invigilator data
-            data_invigilator = pd.concat([staff_df, lecturer_df], ignore_index=True).drop(columns=['Bil'])
-            data_invigilator.dropna(subset=['Nama'], inplace=True)
-            data_invigilator['Nama'] = data_invigilator['Nama'].str.lower().str.strip()
-
-            # Generate timetable with violations check
-            population = initialize_population(data_exam, data_invigilator, contoh_jadual, population_size=100)
-            best_schedule, final_fitness, violations = genetic_algorithm(population, data_exam, data_invigilator)
-            
-            # Format schedule for display
-            formatted_schedule = format_schedule(best_schedule)
-            
-            # Store in session
-            session['current_schedule'] = formatted_schedule
-            session['violations'] = violations
-            
-            flash("Timetable generated successfully! You can now view the dashboard.", "success")
-            
-            return render_template(
-                'index.html', 
-                schedule=formatted_schedule, 
-                fitness=final_fitness,
-                violations=violations
-            )
+            # Run the GA in the background; the page polls /jobs/<id> for progress
+            if request.form.get('replan') == 'on':
+                job_id = job_queue.submit(
+                    replan_timetable, data_exam, data_invigilator, contoh_jadual, base_result_id, seed=seed,
+                    num_generations=1
+                )
+            else:
+                job_id = job_queue.submit(
+                    generate_timetable, data_exam, data_invigilator, contoh_jadual,
+                    config=config, seed=seed, warm_start=warm_start, regenerate=regenerate, engine=engine,
+                    num_generations=config.num_generations if engine == 'ga' else 1
+                )
+
+            if request.accept_mimetypes.best == 'application/json':
+                return jsonify({'job_id': job_id, 'status_url': url_for('job_status', job_id=job_id)}), 202
+
+            return render_template('index.html', job_id=job_id)
 
         except Exception as e:
             flash(f"Error generating timetable: {str(e)}", "error")
@@ -135,119 +165,266 @@ def upload_files():
         flash(f"An unexpected error occurred: {str(e)}", "error")
         return redirect(url_for('index'))
 
+def ga_observers():
+    """Metrics and profiling observers for one GA run, as configured."""
+    folder = app.config['GA_METRICS_FOLDER']
+    if not folder:
+        return []
+    os.makedirs(folder, exist_ok=True)
+    run_name = os.path.join(folder, datetime.now().strftime('run_%Y%m%d_%H%M%S_%f'))
+    observers = [MetricsRecorder(json_path=f"{run_name}.json", csv_path=f"{run_name}.csv")]
+    if app.config['GA_PROFILE']:
+        observers.append(ProfilerObserver(f"{run_name}.prof"))
+    return observers
+
+def ga_parameters(config, engine='ga'):
+    """Engine, GA settings and venue table that, with the inputs and seed, determine a run's result."""
+    return dict(config.to_dict(), islands=app.config['GA_ISLANDS'], engine=engine,
+                venues=[asdict(venue) for venue in app.config['VENUES']])
+
+def generate_timetable(progress, data_exam, data_invigilator, contoh_jadual, config=None, seed=None,
+                       warm_start=False, regenerate=False, engine='ga'):
+    """Background job body: run the chosen engine, or reuse a memoized run, and return the result."""
+    config = config or app.config['GA_CONFIG']
+    inputs_key = input_key(data_exam, data_invigilator, contoh_jadual)
+    key = run_key(inputs_key, ga_parameters(config, engine), seed)
+    if not regenerate:
+        cached = result_cache.lookup(key)
+        if cached is not None and result_store.load(cached['result_id']) is not None:
+            return {'result_id': cached['result_id'], 'fitness': cached['fitness'], 'cached': True}
+
+    # One stream for the whole run, so the seed replays it exactly
+    rng = as_rng(seed)
+
+    # Compile lookups once so the GA loop never touches the DataFrames
+    problem = compile_problem(data_exam, data_invigilator, contoh_jadual, app.config['VENUES'])
+
+    if engine != 'ga':
+        best_schedule, final_fitness, violations = solve(
+            engine, problem, data_exam, data_invigilator, config=config, rng=rng,
+            on_generation=progress
+        )
+        return save_generated(key, inputs_key, best_schedule, final_fitness, violations, [best_schedule])
+
+    # Generate timetable with violations check, topped up around any cached elites
+    population_size = config.population_size
+    population = result_cache.load_elites(inputs_key, problem)[:population_size] if warm_start else []
+    population += initialize_population(
+        data_exam, data_invigilator, contoh_jadual, population_size=population_size - len(population),
+        problem=problem, rng=rng
+    )
+    if app.config['GA_ISLANDS'] > 1:
+        best_schedule, final_fitness, violations = parallel_genetic_algorithm(
+            population, data_exam, data_invigilator, problem=problem, num_islands=app.config['GA_ISLANDS'],
+            on_generation=progress, config=config, rng=rng
+        )
+        elites = [best_schedule]
+    else:
+        elite_recorder = EliteRecorder(app.config['RESULT_MEMO_ELITES'])
+        best_schedule, final_fitness, violations = genetic_algorithm(
+            population, data_exam, data_invigilator, problem=problem, on_generation=progress,
+            observers=ga_observers() + [elite_recorder], config=config, rng=rng
+        )
+        elites = elite_recorder.elites
+    return save_generated(key, inputs_key, best_schedule, final_fitness, violations, elites)
+
+def save_generated(key, inputs_key, best_schedule, final_fitness, violations, elites):
+    """Store a finished run, memoize it under ``key`` and keep its elites for warm starts."""
+    result_id = result_store.save(result_record(format_schedule(best_schedule), final_fitness, violations))
+    result_cache.remember(key, result_id, final_fitness)
+    result_cache.save_elites(inputs_key, elites)
+    return {'result_id': result_id, 'fitness': final_fitness}
+
+def result_record(schedule, fitness, violations):
+    """A stored result: the formatted schedule, its score and its precomputed dashboard aggregates."""
+    return {
+        'schedule': schedule,
+        'fitness': fitness,
+        'violations': violations,
+        'aggregates': build_aggregates(schedule, violations)
+    }
+
+def replan_timetable(progress, data_exam, data_invigilator, contoh_jadual, base_result_id, seed=None):
+    """Background job body: adapt a stored timetable to edited inputs, changing as little as possible."""
+    previous = result_store.load(base_result_id)
+    problem = compile_problem(data_exam, data_invigilator, contoh_jadual, app.config['VENUES'])
+    best_schedule, final_fitness, violations = replan(
+        problem, previous['schedule'], data_exam, data_invigilator,
+        time_budget=app.config['REPLAN_TIME_BUDGET'], rng=as_rng(seed)
+    )
+    progress(1, final_fitness)
+
+    schedule = format_schedule(best_schedule)
+    result_id = result_store.save(result_record(schedule, final_fitness, violations))
+    return {'result_id': result_id, 'fitness': final_fitness, 'changed': changed_exams(previous['schedule'], schedule)}
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Report generation progress, best fitness and ETA for a job."""
+    status = job_queue.status(job_id)
+    if status is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    if status['status'] == 'completed':
+        status['result_url'] = url_for('job_result', job_id=job_id)
+    return jsonify(status)
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Request cancellation of a queued or running job."""
+    if job_queue.status(job_id) is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify({'id': job_id, 'cancelled': job_queue.cancel(job_id)})
+
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    """Show a finished job's timetable and keep its ID for the dashboard."""
+    job = job_queue.result(job_id)
+    result = result_store.load(job['result_id']) if job else None
+    if result is None:
+        flash("That timetable is not ready or could not be generated.", "error")
+        return redirect(url_for('index'))
+
+    # The cookie only carries the result ID; the timetable stays server-side
+    session['result_id'] = job['result_id']
+
+    if 'changed' in job:
+        flash(f"Timetable re-planned: {len(job['changed'])} exam(s) changed.", "success")
+    elif job.get('cached'):
+        flash("These inputs and settings were already scheduled; showing the saved timetable. "
+              "Tick \"Run again\" to generate a new one.", "success")
+    else:
+        flash("Timetable generated successfully! You can now view the dashboard.", "success")
+
+    return render_template(
+        'index.html',
+        schedule=result['schedule'],
+        fitness=result['fitness'],
+        violations=result['violations'],
+        result_id=job['result_id']
+    )
+
 @app.route('/dashboard')
 def dashboard():
-    """Render the dashboard with statistics."""
+    """Render the dashboard shell; its tables page through the /api/results endpoints."""
     try:
-        # Get schedule and violations from session
-        schedule = session.get('current_schedule')
-        violations = session.get('violations', {})
-
-        # Initialize stats
-        invigilator_stats = []
-        exam_details = []
-        overview_stats = {
-            'total_exams': 0,
-            'total_lecturers': 0,
-            'total_staff': 0
-        }
-
-        if schedule:
-            # Calculate statistics only if schedule exists
-            invigilator_stats = calculate_invigilator_stats(schedule)
-            exam_details = prepare_exam_details(schedule)
-            overview_stats = calculate_overview_stats(schedule)
-
-            return render_template(
-                'dashboard.html',
-                invigilator_stats=invigilator_stats,
-                exam_details=exam_details,
-                violations=violations,
-                total_exams=overview_stats['total_exams'],
-                total_lecturers=overview_stats['total_lecturers'],
-                total_staff=overview_stats['total_staff']
-            )
-        else:
-            # If no schedule in session, redirect with message
+        result_id = session.get('result_id')
+        aggregates = load_aggregates(result_id)
+        if aggregates is None:
             flash("Please generate a timetable first before accessing the dashboard.", "warning")
             return redirect(url_for('index'))
 
+        return render_template(
+            'dashboard.html',
+            result_id=result_id,
+            violations=aggregates['violations'],
+            per_day=aggregates['per_day'],
+            per_venue=aggregates['per_venue'],
+            **aggregates['overview']
+        )
+
     except Exception as e:
         # Log the error for debugging
         print(f"Dashboard error: {str(e)}")
         flash(f"An error occurred while loading the dashboard. Please try regenerating the timetable.", "error")
         return redirect(url_for('index'))
 
+def load_aggregates(result_id):
+    """Dashboard aggregates of a stored result, computed once if missing; None if there is no such result."""
+    result = result_store.load(result_id)
+    if result is None:
+        return None
+    if 'aggregates' not in result:
+        result['aggregates'] = build_aggregates(result['schedule'], result.get('violations'))
+    return result['aggregates']
+
+def api_page(result_id, collection, filters):
+    """JSON page of one aggregate list, filtered by the named query parameters."""
+    aggregates = load_aggregates(result_id)
+    if aggregates is None:
+        return jsonify({'error': 'unknown result'}), 404
+    rows = filter_rows(aggregates[collection], **{field: request.args.get(param) for param, field in filters.items()})
+    try:
+        page = paginate(rows, request.args.get('page', 1), request.args.get('per_page', DEFAULT_PER_PAGE))
+    except ValueError:
+        return jsonify({'error': 'page and per_page must be whole numbers'}), 400
+    return jsonify(page)
+
+@app.route('/api/results/<result_id>/summary')
+def api_summary(result_id):
+    """Overview totals, per-day and per-venue counts and the violations summary."""
+    aggregates = load_aggregates(result_id)
+    if aggregates is None:
+        return jsonify({'error': 'unknown result'}), 404
+    return jsonify({key: aggregates[key] for key in ('overview', 'per_day', 'per_venue', 'violations')})
+
+@app.route('/api/results/<result_id>/invigilators')
+def api_invigilators(result_id):
+    """Per-invigilator load, filterable by ``name`` and ``role``."""
+    return api_page(result_id, 'staff_load', {'name': 'name', 'role': 'roles'})
+
+@app.route('/api/results/<result_id>/sessions')
+def api_sessions(result_id):
+    """Individual invigilation duties, filterable by invigilator, role, group, date and course."""
+    return api_page(result_id, 'sessions',
+                    {'invigilator': 'name', 'role': 'role', 'group': 'group', 'date': 'date', 'course': 'course_code'})
+
+@app.route('/api/results/<result_id>/exams')
+def api_exams(result_id):
+    """Exams with their invigilators, filterable by ``course``, ``date``, ``venue`` and ``invigilator``."""
+    return api_page(result_id, 'exams',
+                    {'course': 'course_code', 'date': 'date', 'venue': 'venue', 'invigilator': 'invigilators'})
+
+@app.route('/api/results/<result_id>/violations/<constraint>')
+def api_violation_exams(result_id, constraint):
+    """Exams behind one violated constraint, paginated."""
+    result = result_store.load(result_id)
+    if result is None or constraint not in (result.get('violations') or {}):
+        return jsonify({'error': 'unknown result or constraint'}), 404
+    exams = [
+        {
+            'course_code': exam.get('Kod Kursus'),
+            'date': str(exam.get('Tarikh')),
+            'time': exam.get('Masa'),
+            'venue': exam.get('Tempat'),
+            'invigilators': exam.get('Invigilators', [])
+        }
+        for exam in result['violations'][constraint].get('exams', [])
+    ]
+    try:
+        page = paginate(exams, request.args.get('page', 1), request.args.get('per_page', DEFAULT_PER_PAGE))
+    except ValueError:
+        return jsonify({'error': 'page and per_page must be whole numbers'}), 400
+    return jsonify(page)
+
 @app.route('/export', methods=['POST'])
 def export_timetable():
-    """Export timetable to Excel file."""
+    """Export the stored timetable, or its duty list, as Excel (default), CSV or Parquet."""
     try:
-        schedule_data = request.form.get('schedule_data')
-        if not schedule_data:
+        result = result_store.load(request.form.get('result_id') or session.get('result_id'))
+        if result is None:
             flash("No schedule data available for export", "error")
             return redirect(url_for('index'))
 
-        try:
-            schedule = json.loads(schedule_data)
-        except json.JSONDecodeError as e:
-            flash(f"Error parsing schedule data: {str(e)}", "error")
+        fmt = request.form.get('format', 'xlsx')
+        if fmt not in EXPORT_FORMATS:
+            flash(f"Unknown export format: {fmt}", "error")
             return redirect(url_for('index'))
+        duties = request.form.get('duties') == 'on'
 
-        # Create DataFrame from schedule
-        df = pd.DataFrame(schedule)
-        
-        # Ensure all required columns are present
-        required_columns = [
-            'Date', 'Time', 'Day', 'Course Code', 'Venue',
-            'Lecturer(s)', 'Number of Students', 'Invigilator(s)'
-        ]
-        
-        # Reorder columns if they exist
-        existing_columns = [col for col in required_columns if col in df.columns]
-        df = df[existing_columns]
-
-        # Format date
-        if 'Date' in df.columns:
-            df['Date'] = pd.to_datetime(df['Date']).dt.strftime('%Y-%m-%d')
-
-        # Create Excel file
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            df.to_excel(writer, sheet_name='Timetable', index=False)
-            
-            workbook = writer.book
-            worksheet = writer.sheets['Timetable']
-
-            # Format headers
-            header_format = workbook.add_format({
-                'bold': True,
-                'bg_color': '#3498db',
-                'font_color': 'white',
-                'border': 1,
-                'align': 'center',
-                'valign': 'vcenter'
-            })
-
-            # Apply formats
-            for col_num, value in enumerate(df.columns.values):
-                worksheet.write(0, col_num, value, header_format)
-
-            # Adjust column widths
-            for idx, col in enumerate(df.columns):
-                max_length = max(
-                    df[col].astype(str).apply(len).max(),
-                    len(col)
-                ) + 2
-                worksheet.set_column(idx, idx, max_length)
-
-        output.seek(0)
-        
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"examination_timetable_{timestamp}.xlsx"
-        
+        filename = f"examination_{'duties' if duties and fmt != 'xlsx' else 'timetable'}_{timestamp}.{fmt}"
+
+        # CSV goes out line by line; binary formats are written to a temporary file first
+        if fmt == 'csv':
+            return Response(
+                stream_with_context(iter_csv(result['schedule'], duties=duties)),
+                mimetype=EXPORT_MIMETYPES[fmt],
+                headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+            )
+
         return send_file(
-            output,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            export_file(result['schedule'], fmt, duties=duties),
+            mimetype=EXPORT_MIMETYPES[fmt],
             as_attachment=True,
             download_name=filename
         )
@@ -256,90 +433,5 @@ def export_timetable():
         flash(f"Error exporting timetable: {str(e)}", "error")
         return redirect(url_for('index'))
 
-def calculate_invigilator_stats(schedule):
-    """Calculate detailed statistics for each invigilator's sessions."""
-    stats = []
-    invigilator_session_count = defaultdict(int)
-    
-    # First pass to count total sessions per invigilator
-    for exam in schedule:
-        invigilators = exam['Invigilator(s)'].split(', ') if isinstance(exam['Invigilator(s)'], str) else exam['Invigilator(s)']
-        for invigilator in invigilators:
-            invigilator_session_count[invigilator] += 1
-    
-    # Second pass to create detailed session information
-    for exam in schedule:
-        invigilators = exam['Invigilator(s)'].split(', ') if isinstance(exam['Invigilator(s)'], str) else exam['Invigilator(s)']
-        for invigilator in invigilators:
-            stats.append({
-                'name': invigilator,
-                'date': exam['Date'],
-                'day': exam['Day'],
-                'time': exam['Time'],
-                'course_code': exam['Course Code'],
-                'venue': exam['Venue'],
-                'total_sessions': invigilator_session_count[invigilator]
-            })
-    
-    return sorted(stats, key=lambda x: (x['name'], x['date']))
-
-def prepare_exam_details(schedule):
-    """Prepare detailed exam information."""
-    return [
-        {
-            'course_code': exam['Course Code'],
-            'date': exam['Date'],
-            'venue': exam['Venue'],
-            'students': exam.get('Number of Students', ''),
-            'invigilators': exam['Invigilator(s)'].split(', ') if isinstance(exam['Invigilator(s)'], str) else exam['Invigilator(s)']
-        }
-        for exam in schedule
-    ]
-
-def calculate_overview_stats(schedule):
-    """Calculate overview statistics including proper staff count."""
-    # Get all invigilators
-    all_invigilators = [
-        invigilator.strip()
-        for exam in schedule
-        for invigilator in (exam['Invigilator(s)'].split(', ') if isinstance(exam['Invigilator(s)'], str) else exam['Invigilator(s)'])
-    ]
-    
-    # Count total staff (those marked with (S))
-    total_staff = len(set(
-        invigilator 
-        for invigilator in all_invigilators 
-        if '(S)' in invigilator
-    ))
-    
-    # Count total lecturers (those marked with (L) or (K))
-    total_lecturers = len(set(
-        invigilator 
-        for invigilator in all_invigilators 
-        if '(L)' in invigilator or '(K)' in invigilator
-    ))
-    
-    return {
-        'total_exams': len(schedule),
-        'total_lecturers': total_lecturers,
-        'total_staff': total_staff
-    }
-
-def format_schedule(schedule):
-    """Format schedule for display."""
-    return [
-        {
-            "Course Code": exam['Kod Kursus'],
-            "Date": exam['Tarikh'].strftime('%Y-%m-%d') if isinstance(exam['Tarikh'], pd.Timestamp) else exam['Tarikh'],
-            "Day": exam['Hari'],
-            "Time": exam['Masa'],
-            "Venue": exam['Tempat'],
-            "Lecturer(s)": exam['Lecturer'],
-            "Invigilator(s)": ', '.join(exam['Invigilators']) if isinstance(exam['Invigilators'], list) else exam['Invigilators'],
-            "Number of Students": exam['Bilangan Pelajar']
-        }
-        for exam in schedule
-    ]
-
 if __name__ == '__main__':
     app.run(host="0.0.0.0", port=5000)
@@ -0,0 +1,26 @@
+"""Crash- and concurrency-safe file writes for the on-disk stores."""
+import os
+import tempfile
+
+
+def atomic_write(path, write):
+    """Call ``write`` with a binary file, then move the file to ``path`` in one step.
+
+    The data goes to a '.tmp' file in the same directory first, so readers
+    never see a partial file; it is removed if ``write`` fails.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def atomic_write_bytes(path, data):
+    atomic_write(path, lambda f: f.write(data))
@@ -0,0 +1,182 @@
+"""Time the GA pipeline on synthetic data and write a JSON report.
+
+Run from the repository root, e.g.::
+
+    python -m benchmarks.run --sizes 100x50 1000x500 --output bench.json
+    python -m benchmarks.run --baseline bench.json
+    python -m benchmarks.run --sizes 300x1300 --engines ga greedy cp_sat
+"""
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.synthetic import generate_dataset, generate_venues
+from ga_config import GAConfig
+from ga_model import (calculate_fitness, create_new_generation, evaluate_population, genetic_algorithm,
+                      initialize_population)
+from problem_model import compile_problem
+from solvers import SolverUnavailable, solve
+
+DEFAULT_SIZES = ['100x50', '500x200', '1000x500', '2500x1000', '5000x2000']
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def benchmark_size(n_exams, n_staff, population_size=100, num_generations=30, seed=0, measure_memory=True,
+                   repair_budget=0.0):
+    """Benchmark one problem size and return a flat dict of measurements."""
+    data_exam, data_invigilator, contoh_jadual = generate_dataset(n_exams, n_staff, seed)
+
+    problem, compile_seconds = _timed(compile_problem, data_exam, data_invigilator, contoh_jadual,
+                                      generate_venues(data_exam))
+    population, init_seconds = _timed(
+        initialize_population, data_exam, data_invigilator, contoh_jadual, population_size, problem=problem,
+        rng=seed
+    )
+
+    # Single-schedule scoring, the pre-vectorization hot path
+    sample = population[:min(20, population_size)]
+    _, fitness_seconds = _timed(lambda: [calculate_fitness(schedule, data_exam, data_invigilator, problem)
+                                         for schedule in sample])
+
+    # Whole-population scoring, with the cache cleared so every individual counts
+    for schedule in population:
+        schedule.fitness = None
+    _, population_seconds = _timed(evaluate_population, population, problem)
+
+    _, generation_seconds = _timed(create_new_generation, population, data_exam, data_invigilator, problem=problem,
+                                   rng=seed)
+
+    generations = []
+    ga_result, ga_seconds = _timed(
+        genetic_algorithm, population, data_exam, data_invigilator, num_generations=num_generations,
+        problem=problem, on_generation=lambda generation, best: generations.append(generation),
+        repair_budget=repair_budget, rng=seed
+    )
+    elite_size = min(20, population_size)
+    ga_evaluations = len(generations) * (population_size - elite_size)
+
+    result = {
+        'n_exams': n_exams,
+        'n_staff': problem.n_staff,
+        'n_slots': problem.n_slots,
+        'population_size': population_size,
+        'repair_budget': repair_budget,
+        'compile_seconds': compile_seconds,
+        'initialize_population_seconds': init_seconds,
+        'calculate_fitness_evals_per_sec': len(sample) / fitness_seconds,
+        'evaluate_population_evals_per_sec': population_size / population_seconds,
+        'create_new_generation_seconds': generation_seconds,
+        'genetic_algorithm_seconds': ga_seconds,
+        'genetic_algorithm_generations': len(generations),
+        'genetic_algorithm_evals_per_sec': ga_evaluations / ga_seconds if ga_seconds else None,
+        'best_fitness': ga_result[1],
+        'peak_memory_mb': None,
+    }
+
+    # Separate traced run: tracemalloc slows allocation-heavy code, so keep it out of the timings
+    if measure_memory:
+        tracemalloc.start()
+        population = initialize_population(data_exam, data_invigilator, contoh_jadual, population_size,
+                                           problem=problem, rng=seed)
+        genetic_algorithm(population, data_exam, data_invigilator, num_generations=num_generations, problem=problem,
+                          repair_budget=repair_budget, rng=seed)
+        result['peak_memory_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+    return result
+
+
+def benchmark_engines(n_exams, n_staff, engines, population_size=100, num_generations=30, seed=0,
+                      time_budget=None):
+    """Solve one problem size with each engine and return its wall time and fitness per engine."""
+    data_exam, data_invigilator, contoh_jadual = generate_dataset(n_exams, n_staff, seed)
+    problem = compile_problem(data_exam, data_invigilator, contoh_jadual, generate_venues(data_exam))
+    config = GAConfig(population_size=population_size, elite_size=min(20, population_size),
+                      num_generations=num_generations, time_budget=time_budget)
+
+    results = {}
+    for engine in engines:
+        try:
+            (_, fitness, _), seconds = _timed(solve, engine, problem, data_exam, data_invigilator, config=config,
+                                              rng=seed)
+        except SolverUnavailable as e:
+            print(f"  {engine}: skipped ({e})")
+            continue
+        results[engine] = {'seconds': seconds, 'best_fitness': fitness}
+    return results
+
+
+def compare(report, baseline):
+    """Print per-size speedups of ``report`` over ``baseline``."""
+    previous = {(row['n_exams'], row['n_staff']): row for row in baseline['results']}
+    for row in report['results']:
+        base = previous.get((row['n_exams'], row['n_staff']))
+        if base is None:
+            continue
+        print(f"{row['n_exams']} exams x {row['n_staff']} staff:")
+        for key in ('initialize_population_seconds', 'create_new_generation_seconds', 'genetic_algorithm_seconds'):
+            if base.get(key) and row.get(key):
+                print(f"  {key}: {base[key]:.3f}s -> {row[key]:.3f}s ({base[key] / row[key]:.1f}x)")
+        for key in ('calculate_fitness_evals_per_sec', 'evaluate_population_evals_per_sec'):
+            if base.get(key) and row.get(key):
+                print(f"  {key}: {base[key]:.0f} -> {row[key]:.0f} ({row[key] / base[key]:.1f}x)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES, help="EXAMSxSTAFF pairs, e.g. 1000x500")
+    parser.add_argument('--population', type=int, default=100)
+    parser.add_argument('--generations', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repair-budget', type=float, default=0.0, help="local-search seconds per generation")
+    parser.add_argument('--engines', nargs='+', help="also time these solvers.SOLVERS engines on each size")
+    parser.add_argument('--time-budget', type=float, help="seconds per engine run")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc peak-memory pass")
+    parser.add_argument('--output', default='bench_report.json')
+    parser.add_argument('--baseline', help="earlier report to compare against")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'results': [],
+    }
+    for size in args.sizes:
+        n_exams, n_staff = (int(part) for part in size.lower().split('x'))
+        row = benchmark_size(n_exams, n_staff, args.population, args.generations, args.seed,
+                             measure_memory=not args.no_memory, repair_budget=args.repair_budget)
+        report['results'].append(row)
+        print(f"{n_exams} exams x {n_staff} staff: init {row['initialize_population_seconds']:.3f}s, "
+              f"GA {row['genetic_algorithm_seconds']:.3f}s, best fitness {row['best_fitness']}")
+        if args.engines:
+            row['engines'] = benchmark_engines(n_exams, n_staff, args.engines, args.population, args.generations,
+                                               args.seed, args.time_budget)
+            for engine, measured in row['engines'].items():
+                print(f"  {engine}: {measured['seconds']:.3f}s, best fitness {measured['best_fitness']}")
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+    if baseline is not None:
+        compare(report, baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""Synthetic exam, invigilator and sample-schedule data for benchmarking.
+
+``generate_dataset`` returns DataFrames already cleaned the way
+``upload_files`` leaves them, ready for ``initialize_population``.
+``write_workbooks`` writes the same data as the three Excel uploads, and
+``generate_venues`` a hall table large enough for the busiest session.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from venues import Venue
+
+DAYS = ['Isnin', 'Selasa', 'Rabu', 'Khamis', 'Jumaat', 'Sabtu', 'Ahad']
+SESSIONS = {
+    'PAGI': ('9:00:00 AM', '12:00:00 PM'),
+    'PETANG': ('2:15:00 PM', '5:15:00 PM'),
+}
+FIRST_NAMES = ['AHMAD', 'SITI', 'NUR', 'MOHD', 'FARAH', 'HAFIZ', 'AINA', 'IZZAT', 'NORA', 'ZUL', 'AMIRA', 'RAZAK']
+SURNAMES = ['ABDULLAH', 'ISMAIL', 'HASSAN', 'OMAR', 'YUSOF', 'IBRAHIM', 'RAHMAN', 'SALLEH', 'ZAKARIA', 'KASSIM']
+STAFF_ROLES = ['KERANI', 'KERANI KANAN', 'PEMBANTU OPERASI', 'PENGAWAL KESELAMATAN', 'PENOLONG PENDAFTAR']
+
+
+def _names(rng, count):
+    names = []
+    for idx in range(count):
+        first = FIRST_NAMES[rng.integers(len(FIRST_NAMES))]
+        last = SURNAMES[rng.integers(len(SURNAMES))]
+        names.append(f"{first} {idx:04d} BIN {last}")
+    return names
+
+
+def generate_dataset(n_exams, n_staff, seed=0, lecturer_share=0.4, senior_share=0.5, n_days=15):
+    """Return ``(data_exam, data_invigilator, contoh_jadual)`` of the given size.
+
+    ``lecturer_share`` of the staff are lecturers, ``senior_share`` of whom
+    are Pensyarah Kanan. Each exam gets one or two lecturers in the sample
+    schedule.
+    """
+    rng = np.random.default_rng(seed)
+
+    n_lecturers = max(2, int(n_staff * lecturer_share))
+    n_seniors = max(1, int(n_lecturers * senior_share))
+    names = _names(rng, n_staff)
+    roles = (['PENSYARAH KANAN'] * n_seniors + ['PENSYARAH'] * (n_lecturers - n_seniors)
+             + [STAFF_ROLES[idx] for idx in rng.integers(len(STAFF_ROLES), size=n_staff - n_lecturers)])
+    data_invigilator = pd.DataFrame({
+        'No. Pekerja': rng.integers(100000, 400000, size=n_staff),
+        'Nama': [name.lower().strip() for name in names],
+        'Jawatan': roles,
+        'Jantina': rng.choice(['MALE', 'FEMALE'], size=n_staff),
+    })
+
+    dates = pd.Timestamp('2024-07-15') + pd.to_timedelta(rng.integers(n_days, size=n_exams), unit='D')
+    sessions = rng.choice(list(SESSIONS), size=n_exams)
+    courses = [f"CSC{idx:04d}" for idx in range(n_exams)]
+    data_exam = pd.DataFrame({
+        'Tarikh': dates,
+        'Hari': [DAYS[date.dayofweek] for date in dates],
+        'Waktu': sessions,
+        'Kod Kursus': courses,
+        'Kod Setara': '-',
+        'Masa Mula': [SESSIONS[session][0] for session in sessions],
+        'Masa Tamat': [SESSIONS[session][1] for session in sessions],
+        'Jumlah Pelajar': rng.integers(5, 200, size=n_exams),
+    })
+
+    rows = []
+    for course, date, session in zip(courses, dates, sessions):
+        for lecturer in rng.choice(n_lecturers, size=rng.integers(1, 3), replace=False):
+            rows.append({
+                'Tarikh': date,
+                'Masa': session,
+                'Kod Kursus': course,
+                'Kod Program': 'CDCS230',
+                'Kumpulan': f"{course}A",
+                'Bilangan Calon': int(rng.integers(5, 60)),
+                'Pensyarah': names[lecturer],
+                'Tempat': '',
+            })
+    contoh_jadual = pd.DataFrame(rows)
+
+    # Staff before lecturers, as upload_files concatenates the two sheets
+    is_lecturer = data_invigilator['Jawatan'].str.contains('PENSYARAH')
+    data_invigilator = pd.concat([data_invigilator[~is_lecturer], data_invigilator[is_lecturer]], ignore_index=True)
+    return data_exam, data_invigilator, contoh_jadual
+
+
+def generate_venues(data_exam, hall_capacity=300, slack=1.25):
+    """Equal halls seating the busiest session's students with ``slack`` to spare."""
+    peak = data_exam.groupby(['Tarikh', 'Masa Mula'])['Jumlah Pelajar'].sum().max()
+    n_halls = max(1, int(np.ceil(peak * slack / hall_capacity)))
+    return tuple(Venue(f"DEWAN {idx + 1:02d}", hall_capacity) for idx in range(n_halls))
+
+
+def write_workbooks(directory, n_exams, n_staff, seed=0):
+    """Write the three upload workbooks for a synthetic dataset and return their paths."""
+    data_exam, data_invigilator, contoh_jadual = generate_dataset(n_exams, n_staff, seed)
+    os.makedirs(directory, exist_ok=True)
+    paths = {
+        'data_exam': os.path.join(directory, 'DATA EXAM.xlsx'),
+        'data_invigilator': os.path.join(directory, 'DATA INVIGILATOR.xlsx'),
+        'contoh_jadual': os.path.join(directory, 'CONTOH JADUAL.xlsx'),
+    }
+
+    exam_sheet = data_exam.copy()
+    exam_sheet.columns = ['TARIKH', 'HARI', 'WAKTU', 'KURSUS', 'KURSUS SETARA', 'MASA MULA', 'MASA TAMAT',
+                          'JUMLAH PELAJAR']
+    exam_sheet.to_excel(paths['data_exam'], index=False)
+
+    invigilators = data_invigilator.assign(Nama=data_invigilator['Nama'].str.upper())
+    is_lecturer = invigilators['Jawatan'].str.contains('PENSYARAH')
+    with pd.ExcelWriter(paths['data_invigilator']) as writer:
+        for sheet_name, sheet in (('STAFF(S)', invigilators[~is_lecturer]), ('LECTERUR(L & K)', invigilators[is_lecturer])):
+            sheet = sheet.reset_index(drop=True)
+            sheet.insert(0, 'BIL', range(1, len(sheet) + 1))
+            sheet.columns = ['BIL', 'NO. PEKERJA', 'NAMA', 'JAWATAN', 'JANTINA']
+            sheet.to_excel(writer, sheet_name=sheet_name, index=False)
+
+    sample = contoh_jadual.assign(Pengawas='', Unused='')
+    sample.columns = ['TARIKH', 'SESI', 'KOD KURSUS', 'COURSE', 'KUMPULAN', 'BIL CALON', 'PENSYARAH', 'TEMPAT',
+                      'PENGAWAS', 'CATATAN']
+    sample.to_excel(paths['contoh_jadual'], index=False)
+
+    return paths
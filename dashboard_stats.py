@@ -0,0 +1,136 @@
+"""Dashboard aggregates, computed once per stored timetable.
+
+``build_aggregates`` walks the formatted schedule a single time and
+returns everything the dashboard shows: overview totals, per-invigilator
+load and sessions, per-day and per-venue counts, exam rows and a
+violations summary. The result is saved with the timetable, and the JSON
+endpoints only filter and page through these lists.
+"""
+from timetable_export import split_invigilators, split_label
+
+# Shown as high-severity; the rest of HARD_CONSTRAINTS as medium, anything else as soft
+SEVERE_CONSTRAINTS = ('Ketua Not Pensyarah Kanan', 'Lecturer Invigilating Own Exam', 'Invigilator Time Clash',
+                      'Venue Over Capacity')
+HARD_CONSTRAINTS = SEVERE_CONSTRAINTS + ('Exceeded Invigilation Limit', 'Insufficient Invigilators')
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 500
+
+
+def build_aggregates(schedule, violations):
+    """All dashboard aggregates for a formatted schedule and its violations."""
+    sessions = []
+    exams = []
+    labels = set()
+    load = {}
+    per_day = {}
+    per_venue = {}
+
+    for exam in schedule:
+        date, venue = str(exam.get('Date', '')), exam.get('Venue', '')
+        invigilators = split_invigilators(exam.get('Invigilator(s)'))
+        students = exam.get('Number of Students') or 0
+        exams.append({
+            'course_code': exam.get('Course Code', ''),
+            'date': date,
+            'day': exam.get('Day', ''),
+            'time': exam.get('Time', ''),
+            'venue': venue,
+            'students': exam.get('Number of Students', ''),
+            'invigilators': invigilators,
+        })
+
+        day = per_day.setdefault(date, {'date': date, 'day': exam.get('Day', ''), 'exams': 0, 'duties': 0,
+                                        'students': 0})
+        place = per_venue.setdefault(venue, {'venue': venue, 'exams': 0, 'duties': 0, 'students': 0})
+        for counts in (day, place):
+            counts['exams'] += 1
+            counts['duties'] += len(invigilators)
+            counts['students'] += students if isinstance(students, int) else 0
+
+        for label in invigilators:
+            labels.add(label)
+            name, role = split_label(label)
+            staff = load.setdefault(name, {'name': name, 'roles': [], 'sessions': 0, 'ketua_sessions': 0,
+                                           'dates': []})
+            if role and role not in staff['roles']:
+                staff['roles'].append(role)
+            staff['sessions'] += 1
+            staff['ketua_sessions'] += role == 'Ketua'
+            if date not in staff['dates']:
+                staff['dates'].append(date)
+            sessions.append({
+                'name': name,
+                'label': label,
+                'role': role,
+                'group': 'staff' if role == 'Staff' else 'lecturer',
+                'date': date,
+                'day': exam.get('Day', ''),
+                'time': exam.get('Time', ''),
+                'course_code': exam.get('Course Code', ''),
+                'venue': venue,
+            })
+
+    for staff in load.values():
+        staff['dates'].sort()
+    for session_row in sessions:
+        session_row['total_sessions'] = load[session_row['name']]['sessions']
+    sessions.sort(key=lambda row: (row['name'].lower(), row['date'], row['time']))
+
+    violation_summary = [
+        {
+            'constraint': constraint,
+            'count': details.get('count', 0),
+            'exams': len(details.get('exams', [])),
+            'hard': constraint in HARD_CONSTRAINTS,
+        }
+        for constraint, details in (violations or {}).items()
+    ]
+
+    return {
+        'overview': {
+            'total_exams': len(exams),
+            'total_lecturers': len({label for label in labels if '(L)' in label or '(K)' in label}),
+            'total_staff': len({label for label in labels if '(S)' in label}),
+            'total_invigilators': len(load),
+            'total_duties': len(sessions),
+            'total_violations': sum(row['count'] for row in violation_summary),
+        },
+        'staff_load': sorted(load.values(), key=lambda row: row['name'].lower()),
+        'sessions': sessions,
+        'exams': exams,
+        'per_day': sorted(per_day.values(), key=lambda row: row['date']),
+        'per_venue': sorted(per_venue.values(), key=lambda row: row['venue']),
+        'violations': violation_summary,
+    }
+
+
+def filter_rows(rows, **filters):
+    """Rows whose fields contain each non-empty filter value, case-insensitively.
+
+    A field holding a list matches if any of its items does.
+    """
+    filters = {field: str(value).lower() for field, value in filters.items() if value}
+    if not filters:
+        return rows
+
+    def matches(row):
+        for field, value in filters.items():
+            content = row.get(field, '')
+            items = content if isinstance(content, list) else [content]
+            if not any(value in str(item).lower() for item in items):
+                return False
+        return True
+
+    return [row for row in rows if matches(row)]
+
+
+def paginate(rows, page=1, per_page=DEFAULT_PER_PAGE):
+    """One page of ``rows`` with the paging metadata the dashboard needs."""
+    per_page = max(1, min(int(per_page), MAX_PER_PAGE))
+    total = len(rows)
+    pages = max(1, -(-total // per_page))
+    page = max(1, min(int(page), pages))
+    start = (page - 1) * per_page
+    return {'items': rows[start:start + per_page], 'page': page, 'per_page': per_page, 'total': total,
+            'pages': pages}
@@ -0,0 +1,152 @@
+import numpy as np
+
+from venues import overfull_exams
+
+
+class FitnessState:
+    """Incrementally maintained fitness of one genome.
+
+    Tracks per-staff invigilation counts, the per-exam Ketua, own-exam and
+    Friday penalties, and a (date, session) -> staff bitset index of who is
+    already booked in each time slot, so reassigning a single invigilator
+    slot can be scored, applied and undone in constant time. The genome's
+    genes and cached fitness are kept in sync with every move. Moves never
+    change venues, so the hall-capacity penalty is a fixed ``venue_penalty``.
+    """
+
+    def __init__(self, genome):
+        problem = genome.problem
+        self.genome = genome
+        self.problem = problem
+
+        invigilators = genome.invigilators
+
+        # Plain lists: scalar indexing is several times faster than on arrays
+        self._genes = invigilators.tolist()
+        self._slot_exam = problem.slot_exam.tolist()
+        self._is_ketua = np.zeros(problem.n_slots, dtype=bool)
+        self._is_ketua[problem.ketua_slots] = True
+        self._is_ketua = self._is_ketua.tolist()
+        self._is_senior = problem.is_senior.tolist()
+        self._is_male = problem.is_male.tolist()
+        self._is_friday = problem.is_friday.tolist()
+        self._limits = problem.limits.tolist()
+        self._lecturer_masks = problem.exam_lecturer_masks
+        self._slot_time_slot = problem.slot_time_slot.tolist()
+        self._n_staff = problem.n_staff
+
+        slot_penalties = [self._slot_penalty(slot, staff_id) for slot, staff_id in enumerate(self._genes)]
+        self.exam_penalties = np.bincount(
+            problem.slot_exam, weights=slot_penalties, minlength=problem.n_exams
+        ).astype(np.int64).tolist()
+
+        assigned = invigilators[invigilators >= 0]
+        self.counts = np.bincount(assigned, minlength=problem.n_staff).tolist()
+        over_limit = sum(max(count - limit, 0) for count, limit in zip(self.counts, self._limits))
+
+        # Bookings per (time slot, staff) key, and per time slot a bitset of the staff booked in it
+        self.time_slot_counts = {}
+        self.busy = [0] * problem.n_time_slots
+        clashes = 0
+        for slot, staff_id in enumerate(self._genes):
+            if staff_id >= 0:
+                clashes += self._book(self._slot_time_slot[slot], staff_id, 1) > 1
+
+        self.venue_penalty = 2 * int(np.count_nonzero(overfull_exams(problem, genome.venues[None, :])))
+        self.fitness = sum(self.exam_penalties) + over_limit + 2 * clashes + self.venue_penalty
+        self._history = []
+        genome.fitness = self.fitness
+
+    def _slot_penalty(self, slot, staff_id):
+        """Ketua, own-exam and Friday penalty for one staff ID placed in a slot."""
+        if staff_id < 0:
+            return 2 if self._is_ketua[slot] else 0
+        exam_idx = self._slot_exam[slot]
+        penalty = 0
+        if self._is_ketua[slot] and not self._is_senior[staff_id]:
+            penalty += 2
+        if self._lecturer_masks[exam_idx] >> staff_id & 1:
+            penalty += 2
+        if self._is_friday[exam_idx] and self._is_male[staff_id]:
+            penalty += 1
+        return penalty
+
+    def _limit_delta(self, old_id, new_id):
+        if old_id == new_id:
+            return 0
+        delta = 0
+        if old_id >= 0 and self.counts[old_id] > self._limits[old_id]:
+            delta -= 1
+        if new_id >= 0 and self.counts[new_id] >= self._limits[new_id]:
+            delta += 1
+        return delta
+
+    def _book(self, time_slot, staff_id, change):
+        """Add ``change`` bookings of a staff member in a time slot and return the new count."""
+        key = time_slot * self._n_staff + staff_id
+        count = self.time_slot_counts.get(key, 0) + change
+        if count:
+            self.time_slot_counts[key] = count
+        else:
+            del self.time_slot_counts[key]
+        if count == 1 and change > 0:
+            self.busy[time_slot] |= 1 << staff_id
+        elif count == 0:
+            self.busy[time_slot] &= ~(1 << staff_id)
+        return count
+
+    def bookings(self, time_slot, staff_id):
+        """How many slots of ``time_slot`` the staff member currently holds."""
+        return self.time_slot_counts.get(time_slot * self._n_staff + staff_id, 0)
+
+    def _clash_delta(self, slot, old_id, new_id):
+        if old_id == new_id:
+            return 0
+        time_slot = self._slot_time_slot[slot]
+        delta = 0
+        if old_id >= 0 and self.bookings(time_slot, old_id) > 1:
+            delta -= 2
+        if new_id >= 0 and self.busy[time_slot] >> new_id & 1:
+            delta += 2
+        return delta
+
+    def move_delta(self, slot, staff_id):
+        """Fitness change from putting ``staff_id`` in ``slot``, without applying it."""
+        old_id = self._genes[slot]
+        return (self._slot_penalty(slot, staff_id) - self._slot_penalty(slot, old_id)
+                + self._limit_delta(old_id, staff_id) + self._clash_delta(slot, old_id, staff_id))
+
+    def _set(self, slot, staff_id):
+        old_id = self._genes[slot]
+        slot_delta = self._slot_penalty(slot, staff_id) - self._slot_penalty(slot, old_id)
+        delta = slot_delta + self._limit_delta(old_id, staff_id) + self._clash_delta(slot, old_id, staff_id)
+
+        time_slot = self._slot_time_slot[slot]
+        if old_id >= 0:
+            self.counts[old_id] -= 1
+            self._book(time_slot, old_id, -1)
+        if staff_id >= 0:
+            self.counts[staff_id] += 1
+            self._book(time_slot, staff_id, 1)
+        self.exam_penalties[self._slot_exam[slot]] += slot_delta
+        self._genes[slot] = staff_id
+        self.genome.set_slot(slot, staff_id)
+
+        self.fitness += delta
+        self.genome.fitness = self.fitness
+        return old_id, delta
+
+    def apply_move(self, slot, staff_id):
+        """Put ``staff_id`` (-1 to empty) in ``slot`` and return the fitness delta."""
+        old_id, delta = self._set(slot, staff_id)
+        self._history.append((slot, old_id))
+        return delta
+
+    def undo_move(self):
+        """Revert the most recent applied move and return its fitness delta."""
+        slot, old_id = self._history.pop()
+        return self._set(slot, old_id)[1]
+
+    def commit(self):
+        """Forget the undo history, keeping the current genes."""
+        self._history.clear()
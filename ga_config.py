@@ -0,0 +1,119 @@
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Callable, Optional, Union
+
+CROSSOVERS = ('one_point', 'uniform', 'per_day')
+MUTATIONS = ('ketua', 'reassign', 'swap')
+
+_TRUE = {'1', 'true', 'yes', 'on'}
+_FALSE = {'0', 'false', 'no', 'off', ''}
+
+
+@dataclass(frozen=True)
+class GAConfig:
+    """Settings for one GA run.
+
+    ``crossover`` and ``mutation`` name an operator from ``CROSSOVERS`` and
+    ``MUTATIONS`` or are callables with the same signature as
+    ``perform_crossover`` / ``perform_mutation``. With ``adaptive_mutation``
+    the mutation rate moves between ``min_mutation_rate`` and
+    ``max_mutation_rate`` as gene diversity falls below
+    ``diversity_target``. A run stops at ``num_generations``, at
+    ``target_fitness`` (counted above the problem's fixed ``venue_penalty``),
+    after ``patience`` generations without improvement, or once
+    ``time_budget`` seconds have passed.
+    """
+
+    population_size: int = 100
+    elite_size: int = 20
+    tournament_size: int = 3
+    num_generations: int = 30
+    target_fitness: int = 0
+    patience: int = 10
+    time_budget: Optional[float] = None
+    crossover: Union[str, Callable] = 'one_point'
+    mutation: Union[str, Callable] = 'ketua'
+    mutation_rate: float = 0.0
+    adaptive_mutation: bool = False
+    min_mutation_rate: float = 0.05
+    max_mutation_rate: float = 0.5
+    diversity_target: float = 0.2
+    repair_budget: float = 0.0
+    repair_count: int = 1
+
+    def __post_init__(self):
+        for name in ('population_size', 'tournament_size', 'num_generations', 'patience'):
+            if getattr(self, name) < 1:
+                raise ValueError(f"{name} must be at least 1")
+        if not 0 <= self.elite_size <= self.population_size:
+            raise ValueError("elite_size must be between 0 and population_size")
+        if self.time_budget is not None and self.time_budget <= 0:
+            raise ValueError("time_budget must be positive")
+        for name in ('mutation_rate', 'min_mutation_rate', 'max_mutation_rate'):
+            if not 0 <= getattr(self, name) <= 1:
+                raise ValueError(f"{name} must be between 0 and 1")
+        if self.min_mutation_rate > self.max_mutation_rate:
+            raise ValueError("min_mutation_rate must not exceed max_mutation_rate")
+        if self.diversity_target <= 0:
+            raise ValueError("diversity_target must be positive")
+        if self.repair_budget < 0 or self.repair_count < 0:
+            raise ValueError("repair_budget and repair_count must not be negative")
+        if not (callable(self.crossover) or self.crossover in CROSSOVERS):
+            raise ValueError(f"crossover must be one of {', '.join(CROSSOVERS)}")
+        if not (callable(self.mutation) or self.mutation in MUTATIONS):
+            raise ValueError(f"mutation must be one of {', '.join(MUTATIONS)}")
+
+    @classmethod
+    def from_mapping(cls, mapping, base=None, limits=None):
+        """Config from string values such as form fields, on top of ``base``.
+
+        Unknown keys raise ValueError, as do values that do not convert to
+        the field's type or exceed their maximum in ``limits``. Empty values
+        leave the base setting unchanged. The base elite count is capped at a
+        smaller requested population.
+        """
+        base = base or cls()
+        types = {field.name: field.type for field in fields(cls)}
+        changes = {}
+        for name, value in mapping.items():
+            if name not in types:
+                raise ValueError(f"Unknown GA setting: {name}")
+            if isinstance(value, str):
+                value = value.strip()
+                if not value:
+                    continue
+            changes[name] = _convert(name, types[name], value)
+            if limits and name in limits and changes[name] > limits[name]:
+                raise ValueError(f"{name} must be at most {limits[name]}")
+        if 'elite_size' not in changes and isinstance(changes.get('population_size'), int):
+            changes['elite_size'] = min(base.elite_size, changes['population_size'])
+        return replace(base, **changes)
+
+    def replace(self, **changes):
+        return replace(self, **changes)
+
+    def to_dict(self):
+        return asdict(self)
+
+    def mutation_rate_for(self, diversity):
+        """Mutation rate for a population whose gene diversity is ``diversity`` (0-1)."""
+        if not self.adaptive_mutation:
+            return self.mutation_rate
+        shortfall = max(0.0, 1.0 - diversity / self.diversity_target)
+        return self.min_mutation_rate + (self.max_mutation_rate - self.min_mutation_rate) * shortfall
+
+
+def _convert(name, field_type, value):
+    if not isinstance(value, str):
+        return value
+    try:
+        if field_type is bool:
+            if value.lower() not in _TRUE | _FALSE:
+                raise ValueError(value)
+            return value.lower() in _TRUE
+        if field_type is int:
+            return int(value)
+        if field_type in (float, Optional[float]):
+            return float(value)
+    except ValueError:
+        raise ValueError(f"Invalid value for {name}: {value!r}")
+    return value
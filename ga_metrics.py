@@ -0,0 +1,83 @@
+import cProfile
+import csv
+import json
+import os
+from collections import defaultdict
+
+PHASES = ('evaluate', 'select', 'crossover', 'mutate', 'repair')
+
+
+class GenerationTimer:
+    """Accumulates wall time per GA phase and the number of fitness evaluations."""
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.evaluations = 0
+
+
+class GAObserver:
+    """Base class for ``genetic_algorithm`` observers; override the hooks you need."""
+
+    def on_start(self, problem, population):
+        pass
+
+    def on_generation(self, stats):
+        """Called with a dict of per-generation statistics (see MetricsRecorder)."""
+        pass
+
+    def on_finish(self, best_schedule, best_fitness, population):
+        """Called once with the overall best and the final population."""
+        pass
+
+
+class MetricsRecorder(GAObserver):
+    """Keeps every generation's statistics and writes them as a JSON and/or CSV trace.
+
+    Each record has the generation number, wall time, seconds per phase,
+    evaluations and evaluations/sec, best/mean/std of population fitness,
+    the number of distinct fitness values and the best schedule's penalty
+    per constraint.
+    """
+
+    def __init__(self, json_path=None, csv_path=None):
+        self.json_path = json_path
+        self.csv_path = csv_path
+        self.records = []
+
+    def on_generation(self, stats):
+        self.records.append(stats)
+
+    def on_finish(self, best_schedule, best_fitness, population):
+        if self.json_path:
+            with open(self.json_path, 'w') as f:
+                json.dump({'best_fitness': best_fitness, 'generations': self.records}, f, indent=2)
+        if self.csv_path and self.records:
+            rows = [self._flatten(record) for record in self.records]
+            with open(self.csv_path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+                writer.writeheader()
+                writer.writerows(rows)
+
+    @staticmethod
+    def _flatten(record):
+        row = {key: value for key, value in record.items() if not isinstance(value, dict)}
+        for key, value in record.items():
+            if isinstance(value, dict):
+                row.update({f"{key}.{name}": item for name, item in value.items()})
+        return row
+
+
+class ProfilerObserver(GAObserver):
+    """Runs cProfile for the length of a GA run and dumps the stats to ``path``."""
+
+    def __init__(self, path):
+        self.path = path
+        self._profiler = cProfile.Profile()
+
+    def on_start(self, problem, population):
+        self._profiler.enable()
+
+    def on_finish(self, best_schedule, best_fitness, population):
+        self._profiler.disable()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._profiler.dump_stats(self.path)
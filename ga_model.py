@@ -1,275 +1,524 @@
+import heapq
 import random
-import pandas as pd
+from time import perf_counter
+import numpy as np
+from ga_config import GAConfig
+from ga_metrics import PHASES, GenerationTimer
+from local_search import bitset_array, repair
+from problem_model import Genome, compile_problem
+from seeding import as_rng, spawn_seeds
+from venues import overfull_exams
+
+# Least-Loaded Selection
+def _pick_least_loaded(tiers, headroom, heaps_of, count, excluded, rng):
+    """Pop up to ``count`` staff with the most headroom, trying ``tiers`` in order."""
+    picked = []
+    skipped = []
+    for heaps in tiers:
+        while len(picked) < count:
+            # Lowest valid top across the heaps of this tier
+            best_heap = None
+            for heap in heaps:
+                while heap and heap[0][0] != headroom[heap[0][2]]:
+                    heapq.heappop(heap)
+                if heap and (best_heap is None or heap[0] < best_heap[0]):
+                    best_heap = heap
+            if best_heap is None:
+                break
+
+            entry = heapq.heappop(best_heap)
+            if entry[2] in excluded:
+                skipped.append((best_heap, entry))
+                continue
+            picked.append(entry[2])
+            excluded.add(entry[2])
+
+    for heap, entry in skipped:
+        heapq.heappush(heap, entry)
+
+    # Re-queue the picked staff at their new load, with a fresh random tie-break
+    for staff_id in picked:
+        headroom[staff_id] += 1
+        for heap in heaps_of[staff_id]:
+            heapq.heappush(heap, (headroom[staff_id], rng.random(), staff_id))
+
+    return picked
+
+def _build_individual(problem, rng):
+    """One constraint-aware genome with its own load counts and random tie-breaks."""
+    invigilators = np.full(problem.n_slots, -1, dtype=np.int32)
+    venues = problem.venue_allocation.copy()
+
+    # Load relative to each person's limit, so lecturers absorb their second duty first
+    headroom = (-problem.limits).tolist()
+    is_leader = problem.is_leader_eligible.tolist()
+    is_male = problem.is_male.tolist()
+
+    # Separate heaps by gender so Friday exams can draw women first
+    leader_heaps = {False: [], True: []}
+    staff_heaps = {False: [], True: []}
+    heaps_of = []
+    for staff_id in range(problem.n_staff):
+        heaps = [staff_heaps[is_male[staff_id]]]
+        if is_leader[staff_id]:
+            heaps.append(leader_heaps[is_male[staff_id]])
+        heaps_of.append(heaps)
+        for heap in heaps:
+            heap.append((headroom[staff_id], rng.random(), staff_id))
+    for heap in list(leader_heaps.values()) + list(staff_heaps.values()):
+        heapq.heapify(heap)
+
+    slot_offsets = problem.slot_offsets.tolist()
+    required = problem.required_invigilators.tolist()
+    is_friday = problem.is_friday.tolist()
+    exam_time_slot = problem.exam_time_slot.tolist()
+
+    # Staff already placed in each date and session
+    busy = [set() for _ in range(problem.n_time_slots)]
+
+    for exam_idx in range(problem.n_exams):
+        start = slot_offsets[exam_idx]
+        if is_friday[exam_idx]:
+            leader_tiers = [[leader_heaps[False]], [leader_heaps[True]]]
+            staff_tiers = [[staff_heaps[False]], [staff_heaps[True]]]
+        else:
+            leader_tiers = [[leader_heaps[False], leader_heaps[True]]]
+            staff_tiers = [[staff_heaps[False], staff_heaps[True]]]
 
-# Initialize Population
-def initialize_population(data_exam, data_invigilator, contoh_jadual, population_size=100):
-    # Ensure invigilator data is clean
-    data_invigilator = data_invigilator.dropna(subset=['Nama'])
-    pensyarah_kanan = data_invigilator[data_invigilator['Jawatan'].str.contains('^PENSYARAH KANAN$', case=False, na=False)]
+        # Nobody invigilates their own exam or sits in two exams of the same session
+        time_slot_busy = busy[exam_time_slot[exam_idx]]
+        excluded = time_slot_busy.union(problem.exam_lecturer_ids[exam_idx])
 
-    if pensyarah_kanan.empty:
-        raise ValueError("No eligible Pensyarah Kanan found for Ketua assignment!")
+        # Assign Ketua
+        leader = _pick_least_loaded(leader_tiers, headroom, heaps_of, 1, excluded, rng)
+        if not leader:
+            leader = _pick_least_loaded(leader_tiers, headroom, heaps_of, 1, set(), rng)
+        invigilators[start] = leader[0]
+        excluded.add(leader[0])
+        time_slot_busy.add(leader[0])
 
-    population = []
-    invigilation_counts = {name: 0 for name in data_invigilator['Nama']}
-
-    def assign_random_venue():
-        return random.choice(['DEWAN AKADEMIK', 'DEWAN LESTARI'])
-
-    def classify_invigilator(invigilator_name, is_leader=False):
-        invigilator = data_invigilator[data_invigilator['Nama'] == invigilator_name]
-        if invigilator.empty:
-            raise ValueError(f"Invigilator {invigilator_name} not found in data_invigilator!")
-        invigilator = invigilator.iloc[0]
-        if is_leader:
-            return f"{invigilator_name} (K)"
-        elif 'PENSYARAH' in invigilator['Jawatan']:
-            return f"{invigilator_name} (L)"
-        else:
-            return f"{invigilator_name} (S)"
-
-    for _ in range(population_size):
-        schedule = []
-        for _, row in data_exam.iterrows():
-            exam_details = {
-                'Tarikh': row['Tarikh'],
-                'Hari': row['Hari'],
-                'Waktu': row['Waktu'],
-                'Kod Kursus': row['Kod Kursus'],
-                'Masa': f"{row['Masa Mula']} - {row['Masa Tamat']}",
-                'Bilangan Pelajar': row['Jumlah Pelajar'],
-                'Tempat': assign_random_venue()
-            }
-
-            lecturers = contoh_jadual[contoh_jadual['Kod Kursus'] == row['Kod Kursus']]['Pensyarah'].unique()
-            exam_details['Lecturer'] = ', '.join(lecturers) if len(lecturers) > 0 else 'Unknown'
-
-            # Assign Ketua
-            eligible_leaders = sorted(
-                pensyarah_kanan['Nama'],
-                key=lambda x: invigilation_counts[x]
-            )
-            leader = eligible_leaders[0]
-            invigilation_counts[leader] += 1
-            leader_label = classify_invigilator(leader, is_leader=True)
-
-            # Assign Additional Invigilators
-            required_invigilators = (row['Jumlah Pelajar'] + 29) // 30
-            additional_invigilators = []
-            eligible_invigilators = sorted(
-                [name for name in data_invigilator['Nama'] if name not in lecturers],
-                key=lambda x: invigilation_counts[x]
-            )
-            for _ in range(required_invigilators - 1):
-                if eligible_invigilators:
-                    new_invigilator = eligible_invigilators.pop(0)
-                    additional_invigilators.append(new_invigilator)
-                    invigilation_counts[new_invigilator] += 1
+        # Assign Additional Invigilators
+        if required[exam_idx] > 1:
+            additional = _pick_least_loaded(staff_tiers, headroom, heaps_of, required[exam_idx] - 1, excluded, rng)
+            invigilators[start + 1:start + 1 + len(additional)] = additional
+            time_slot_busy.update(additional)
 
-            invigilators = [leader_label] + [classify_invigilator(inv) for inv in additional_invigilators]
-            exam_details['Invigilators'] = invigilators
-            schedule.append(exam_details)
+    return Genome(problem, invigilators, venues)
 
-        population.append(schedule)
+# Initialize Population
+def initialize_population(data_exam, data_invigilator, contoh_jadual, population_size=100, problem=None,
+                          max_workers=None, rng=None):
+    """Constraint-aware schedules, one per child stream of ``rng``; ``max_workers`` > 1 builds them on a pool."""
+    if problem is None:
+        problem = compile_problem(data_exam, data_invigilator, contoh_jadual)
+
+    if len(problem.leader_ids) == 0:
+        raise ValueError("No eligible Pensyarah Kanan found for Ketua assignment!")
 
-    return population
+    seeds = spawn_seeds(rng, population_size)
+    if max_workers and max_workers > 1 and population_size > 1:
+        from parallel_ga import build_population_parallel
+        return build_population_parallel(problem, seeds, max_workers)
+
+    return [_build_individual(problem, random.Random(seed)) for seed in seeds]
+
+# Penalty Terms
+PENALTY_NAMES = ('Ketua Not Pensyarah Kanan', 'Lecturer Invigilating Own Exam', 'Male Invigilator on Friday',
+                 'Exceeded Invigilation Limit', 'Invigilator Time Clash', 'Venue Over Capacity')
+
+def penalty_terms(invigilator_matrix, problem, venue_matrix=None):
+    """Population x ``PENALTY_NAMES`` penalty matrix for rows of staff IDs (and venues)."""
+    population_size = invigilator_matrix.shape[0]
+    assigned = invigilator_matrix >= 0
+    terms = np.zeros((population_size, len(PENALTY_NAMES)), dtype=np.int64)
+
+    # Constraint 1: Ketua must be Pensyarah Kanan
+    ketua = invigilator_matrix[:, problem.ketua_slots]
+    terms[:, 0] = 2 * np.count_nonzero((ketua < 0) | ~problem.is_senior[ketua], axis=1)
+
+    # Constraint 2: No lecturer should invigilate their own exam
+    terms[:, 1] = 2 * np.count_nonzero(problem.is_own_exam(problem.slot_exam, invigilator_matrix), axis=1)
+
+    # Constraint 3: No male invigilators on Friday
+    friday_male = problem.is_friday[problem.slot_exam] & assigned & problem.is_male[invigilator_matrix]
+    terms[:, 2] = np.count_nonzero(friday_male, axis=1)
+
+    # Check invigilation count limits, one bincount over (individual, staff) keys
+    rows = np.broadcast_to(np.arange(population_size)[:, None], invigilator_matrix.shape)
+    keys = rows[assigned] * problem.n_staff + invigilator_matrix[assigned]
+    invigilation_count = np.bincount(keys, minlength=population_size * problem.n_staff)
+    invigilation_count = invigilation_count.reshape(population_size, problem.n_staff)
+    terms[:, 3] = np.maximum(invigilation_count - problem.limits, 0).sum(axis=1)
+
+    # Constraint 5: Nobody invigilates two exams in the same date and session.
+    # Sorting (time slot, staff) keys per row makes every extra booking an equal neighbour;
+    # empty slots get distinct negative keys so they never match
+    key_dtype = np.int32 if problem.n_time_slots * problem.n_staff < 2 ** 31 else np.int64
+    empty_keys = -1 - np.arange(problem.n_slots, dtype=key_dtype)
+    keys = np.where(assigned, (problem.slot_time_slot * problem.n_staff).astype(key_dtype) + invigilator_matrix,
+                    empty_keys)
+    keys.sort(axis=1)
+    terms[:, 4] = 2 * np.count_nonzero(keys[:, 1:] == keys[:, :-1], axis=1)
+
+    # Constraint 6: Every exam sharing a hall in a session that is over capacity
+    if venue_matrix is None:
+        venue_matrix = np.broadcast_to(problem.venue_allocation, (population_size, problem.n_exams))
+    terms[:, 5] = 2 * np.count_nonzero(overfull_exams(problem, venue_matrix), axis=1)
+
+    return terms
 
 # Fitness Function
-def calculate_fitness(schedule, data_exam, data_invigilator):
-    fitness_score = 0
-    invigilation_count = {name.lower(): 0 for name in data_invigilator['Nama']}
-
-    # Get list of "Pensyarah Kanan"
-    pensyarah_kanan = set(
-        data_invigilator[data_invigilator['Jawatan'].str.contains('PENSYARAH KANAN', case=False, na=False)]['Nama'].str.lower()
-    )
-
-    for exam in schedule:
-        # Constraint 1: Ketua must be Pensyarah Kanan
-        ketua = exam['Invigilators'][0]
-        ketua_name = ketua.split('(')[0].strip().lower()
-        if ketua_name not in pensyarah_kanan:
-            fitness_score += 2
-
-        # Constraint 2: No lecturer should invigilate their own exam
-        lecturers = [lecturer.strip().lower() for lecturer in exam['Lecturer'].split(',')]
-        for invigilator in exam['Invigilators']:
-            invigilator_name = invigilator.split('(')[0].strip().lower()
-            if invigilator_name in lecturers:
-                fitness_score += 2
-
-        # Constraint 3: No male invigilators on Friday
-        if exam['Hari'].strip().lower() == 'jumaat':
-            for invigilator in exam['Invigilators']:
-                invigilator_name = invigilator.split('(')[0].strip().lower()
-                invigilator_record = data_invigilator[data_invigilator['Nama'].str.lower() == invigilator_name]
-                if not invigilator_record.empty:
-                    gender = invigilator_record['Jantina'].values[0].strip().lower()
-                    if gender == 'male':
-                        fitness_score += 1
-
-        # Track invigilation counts
-        for invigilator in exam['Invigilators']:
-            invigilator_name = invigilator.split('(')[0].strip().lower()
-            if invigilator_name in invigilation_count:
-                invigilation_count[invigilator_name] += 1
-
-    # Check invigilation count limits
-    for name, count in invigilation_count.items():
-        role = data_invigilator[data_invigilator['Nama'].str.lower() == name]['Jawatan'].values[0].lower()
-        max_limit = 2 if 'pensyarah' in role else 1
-        if count > max_limit:
-            fitness_score += count - max_limit
-
-    return fitness_score
+def calculate_fitness(schedule, data_exam, data_invigilator, problem=None):
+    problem = problem or schedule.problem
+    return int(penalty_terms(schedule.invigilators[None, :], problem, schedule.venues[None, :]).sum())
+
+# Population Fitness
+def evaluate_population(population, problem=None, timer=None):
+    """Score a whole population in one pass, reusing each schedule's cached score."""
+    problem = problem or population[0].problem
+    start = perf_counter()
+    pending = [schedule for schedule in population if schedule.fitness is None]
+    if pending:
+        invigilator_matrix = np.empty((len(pending), problem.n_slots), dtype=np.int32)
+        venue_matrix = np.empty((len(pending), problem.n_exams), dtype=np.int64)
+        for row, schedule in enumerate(pending):
+            schedule.genes.to_array(out=invigilator_matrix[row])
+            schedule.venue_genes.to_array(out=venue_matrix[row])
+        scores = penalty_terms(invigilator_matrix, problem, venue_matrix).sum(axis=1)
+        for schedule, score in zip(pending, scores.tolist()):
+            schedule.fitness = score
+    if timer is not None:
+        timer.seconds['evaluate'] += perf_counter() - start
+        timer.evaluations += len(pending)
+    return np.array([schedule.fitness for schedule in population], dtype=np.int64)
 
 # Parent Selection
-def select_parents(population, fitness_scores, tournament_size=3):
-    tournament = random.sample(range(len(population)), tournament_size)
+def select_parents(population, fitness_scores, tournament_size=3, rng=None):
+    tournament = as_rng(rng).sample(range(len(population)), min(tournament_size, len(population)))
     tournament_fitness = [fitness_scores[i] for i in tournament]
     return tournament[tournament_fitness.index(min(tournament_fitness))]
 
 # Crossover
-def perform_crossover(parent1, parent2):
+def perform_crossover(parent1, parent2, rng=None):
     if not parent1 or not parent2:
-        return parent1 if parent1 else parent2
+        return (parent1 if parent1 else parent2).copy()
     
-    crossover_point = random.randint(1, len(parent1) - 1)
-    child = parent1[:crossover_point] + parent2[crossover_point:]
+    crossover_point = as_rng(rng).randint(1, len(parent1) - 1)
+    child = parent1.splice(parent2, crossover_point)
     return child
 
+def _mix_exams(parent1, parent2, from_parent2):
+    """Child taking each exam's invigilators and venue from parent2 where ``from_parent2`` is set."""
+    problem = parent1.problem
+    invigilators = np.where(from_parent2[problem.slot_exam], parent2.invigilators, parent1.invigilators)
+    venues = np.where(from_parent2, parent2.venues, parent1.venues)
+    return Genome(problem, invigilators, venues)
+
+# Uniform Crossover
+def uniform_crossover(parent1, parent2, rng=None):
+    """Each exam comes from either parent with equal probability."""
+    if not parent1 or not parent2:
+        return (parent1 if parent1 else parent2).copy()
+    n_exams = parent1.problem.n_exams
+    return _mix_exams(parent1, parent2, bitset_array(as_rng(rng).getrandbits(n_exams), n_exams))
+
+# Per-Day Crossover
+def per_day_crossover(parent1, parent2, rng=None):
+    """Each exam date comes whole from one parent, so no session gains a double booking."""
+    if not parent1 or not parent2:
+        return (parent1 if parent1 else parent2).copy()
+    problem = parent1.problem
+    from_parent2 = bitset_array(as_rng(rng).getrandbits(problem.n_days), problem.n_days)
+    return _mix_exams(parent1, parent2, from_parent2[problem.exam_day])
+
 # Mutation
-def perform_mutation(schedule, data_invigilator, mutation_rate=0.0):
-    if random.random() < mutation_rate:
-        exam_idx = random.randint(0, len(schedule) - 1)
-        pensyarah_kanan = data_invigilator[
-            data_invigilator['Jawatan'].str.contains('PENSYARAH KANAN', case=False, na=False)
-        ]
-        if not pensyarah_kanan.empty:
-            new_leader = random.choice(pensyarah_kanan['Nama'].tolist())
-            schedule[exam_idx]['Invigilators'][0] = f"{new_leader} (K)"
+def perform_mutation(schedule, data_invigilator, mutation_rate=0.0, problem=None, state=None, rng=None):
+    """Replace one exam's Ketua with a senior free in that session."""
+    problem = problem or schedule.problem
+    rng = as_rng(rng)
+    if rng.random() < mutation_rate:
+        exam_idx = rng.randint(0, len(schedule) - 1)
+        if len(problem.senior_ids) > 0:
+            time_slot = problem.exam_time_slot[exam_idx]
+            seniors = problem.senior_ids.tolist()
+            if state is not None:
+                busy = state.busy[time_slot]
+                free = [staff_id for staff_id in seniors if not busy >> staff_id & 1]
+            else:
+                busy = set(problem.time_slot_staff(schedule, time_slot).tolist())
+                free = [staff_id for staff_id in seniors if staff_id not in busy]
+            new_leader = rng.choice(free or seniors)
+            if state is not None:
+                state.apply_move(problem.ketua_slots[exam_idx], new_leader)
+            else:
+                schedule.set_slot(problem.ketua_slots[exam_idx], new_leader)
+    return schedule
+
+def _move(schedule, slot, staff_id, state):
+    if state is not None:
+        state.apply_move(slot, staff_id)
+    else:
+        schedule.set_slot(slot, staff_id)
+
+# Reassign Mutation
+def reassign_mutation(schedule, data_invigilator, mutation_rate=0.0, problem=None, state=None, max_tries=20,
+                      rng=None):
+    """Give one random slot to a random eligible person who is free in that session."""
+    problem = problem or schedule.problem
+    rng = as_rng(rng)
+    if rng.random() < mutation_rate:
+        slot = rng.randrange(problem.n_slots)
+        exam_idx = int(problem.slot_exam[slot])
+        is_ketua = problem.ketua_slots[exam_idx] == slot
+        busy = set(problem.time_slot_staff(schedule, problem.exam_time_slot[exam_idx]).tolist())
+        busy.update(problem.exam_lecturer_ids[exam_idx])
+        pool = problem.senior_ids if is_ketua and len(problem.senior_ids) > 0 else None
+        for _ in range(max_tries):
+            staff_id = int(pool[rng.randrange(len(pool))]) if pool is not None else rng.randrange(problem.n_staff)
+            if staff_id not in busy:
+                _move(schedule, slot, staff_id, state)
+                break
+    return schedule
+
+# Swap Mutation
+def swap_mutation(schedule, data_invigilator, mutation_rate=0.0, problem=None, state=None, rng=None):
+    """Swap the people in two random slots, leaving everyone's duty count unchanged."""
+    problem = problem or schedule.problem
+    rng = as_rng(rng)
+    if rng.random() < mutation_rate and problem.n_slots > 1:
+        slot1, slot2 = rng.sample(range(problem.n_slots), 2)
+        staff1, staff2 = int(schedule.genes[slot1]), int(schedule.genes[slot2])
+        if staff1 != staff2:
+            _move(schedule, slot1, staff2, state)
+            _move(schedule, slot2, staff1, state)
     return schedule
 
+# Operator Registries
+CROSSOVER_OPERATORS = {'one_point': perform_crossover, 'uniform': uniform_crossover, 'per_day': per_day_crossover}
+MUTATION_OPERATORS = {'ketua': perform_mutation, 'reassign': reassign_mutation, 'swap': swap_mutation}
+
+def resolve_operator(operator, registry):
+    """Operator function for a registry name, or the callable itself."""
+    return operator if callable(operator) else registry[operator]
+
+# Population Diversity
+def population_diversity(population, fitness_scores, sample_size=10):
+    """Mean fraction of slots in which evenly spaced members differ from the current best."""
+    best = population[int(np.argmin(fitness_scores))].invigilators
+    sample = np.unique(np.linspace(0, len(population) - 1, min(sample_size, len(population))).astype(int))
+    return float(np.mean([np.mean(population[idx].invigilators != best) for idx in sample.tolist()]))
+
 # Create New Generation
-def create_new_generation(population, data_exam, data_invigilator, elite_size=20):
+def create_new_generation(population, data_exam, data_invigilator, elite_size=20, problem=None,
+                          tournament_size=3, mutation_rate=0.0, timer=None, repair_budget=0.0, repair_count=1,
+                          crossover='one_point', mutation='ketua', rng=None):
+    """Elites plus tournament-selected, crossed and mutated children, optionally repaired."""
+    problem = problem or population[0].problem
+    rng = as_rng(rng)
+    crossover = resolve_operator(crossover, CROSSOVER_OPERATORS)
+    mutation = resolve_operator(mutation, MUTATION_OPERATORS)
+
     population_size = len(population)
-    fitness_scores = [calculate_fitness(schedule, data_exam, data_invigilator) for schedule in population]
-    
-    # Sort population by fitness
-    sorted_population = [x for _, x in sorted(zip(fitness_scores, population), key=lambda pair: pair[0])]
+    fitness_scores = evaluate_population(population, problem, timer)
+    select_seconds = crossover_seconds = mutate_seconds = 0.0
     
-    new_population = []
-    
-    # Keep elite solutions
-    new_population.extend(sorted_population[:elite_size])
+    # Keep elite solutions, best first
+    elite_order = np.argsort(fitness_scores, kind='stable')[:elite_size]
+    new_population = [population[idx] for idx in elite_order]
     
     # Generate rest of population through crossover and mutation
     while len(new_population) < population_size:
-        parent1_idx = select_parents(population, fitness_scores)
-        parent2_idx = select_parents(population, fitness_scores)
+        start = perf_counter()
+        parent1_idx = select_parents(population, fitness_scores, tournament_size, rng)
+        parent2_idx = select_parents(population, fitness_scores, tournament_size, rng)
+        selected = perf_counter()
         
-        child = perform_crossover(population[parent1_idx], population[parent2_idx])
-        child = perform_mutation(child, data_invigilator)
+        child = crossover(population[parent1_idx], population[parent2_idx], rng=rng)
+        crossed = perf_counter()
+        child = mutation(child, data_invigilator, mutation_rate, problem=problem, rng=rng)
         
         new_population.append(child)
+        select_seconds += selected - start
+        crossover_seconds += crossed - selected
+        mutate_seconds += perf_counter() - crossed
     
+    if timer is not None:
+        timer.seconds['select'] += select_seconds
+        timer.seconds['crossover'] += crossover_seconds
+        timer.seconds['mutate'] += mutate_seconds
+
+    # Repair the most promising individuals within the time budget
+    if repair_budget > 0:
+        scores = evaluate_population(new_population, problem, timer)
+        start = perf_counter()
+        deadline = start + repair_budget
+        for idx in np.argsort(scores, kind='stable')[:repair_count].tolist():
+            # Repair a copy, since elites are still shared with the previous generation
+            new_population[idx] = new_population[idx].copy()
+            repair(new_population[idx], deadline=deadline, rng=rng)
+            if perf_counter() > deadline:
+                break
+        if timer is not None:
+            timer.seconds['repair'] += perf_counter() - start
     return new_population
 
 # Check Constraints
-def check_constraints(schedule, data_exam, data_invigilator):
+def check_constraints(schedule, data_exam, data_invigilator, problem=None):
+    problem = problem or schedule.problem
+    invigilators = schedule.invigilators
+    assigned = invigilators >= 0
+
     violations = {
         'Ketua Not Pensyarah Kanan': {'count': 0, 'exams': []},
         'Lecturer Invigilating Own Exam': {'count': 0, 'exams': []},
         'Male Invigilator on Friday': {'count': 0, 'exams': []},
         'Exceeded Invigilation Limit': {'count': 0, 'exams': []},
-        'Insufficient Invigilators': {'count': 0, 'exams': []}
+        'Insufficient Invigilators': {'count': 0, 'exams': []},
+        'Invigilator Time Clash': {'count': 0, 'exams': []},
+        'Venue Over Capacity': {'count': 0, 'exams': []}
     }
-    
-    pensyarah_kanan = set(
-        data_invigilator[data_invigilator['Jawatan'].str.contains('PENSYARAH KANAN', case=False, na=False)]['Nama'].str.lower()
-    )
-
-    # Track invigilation counts for each person
-    invigilation_count = {name.lower(): 0 for name in data_invigilator['Nama']}
-
-    for exam in schedule:
-        # Check Ketua constraint
-        ketua = exam['Invigilators'][0]
-        ketua_name = ketua.split('(')[0].strip().lower()
-        if ketua_name not in pensyarah_kanan:
-            violations['Ketua Not Pensyarah Kanan']['count'] += 2
-            violations['Ketua Not Pensyarah Kanan']['exams'].append(exam)
-
-        # Check lecturer invigilating own exam
-        lecturers = [lecturer.strip().lower() for lecturer in exam['Lecturer'].split(',')]
-        for invigilator in exam['Invigilators']:
-            invigilator_name = invigilator.split('(')[0].strip().lower()
-            if invigilator_name in lecturers:
-                violations['Lecturer Invigilating Own Exam']['count'] += 2
-                violations['Lecturer Invigilating Own Exam']['exams'].append(exam)
-
-        # Check male invigilators on Friday
-        if exam['Hari'].strip().lower() == 'jumaat':
-            for invigilator in exam['Invigilators']:
-                invigilator_name = invigilator.split('(')[0].strip().lower()
-                invigilator_record = data_invigilator[data_invigilator['Nama'].str.lower() == invigilator_name]
-                if not invigilator_record.empty:
-                    gender = invigilator_record['Jantina'].values[0].strip().lower()
-                    if gender == 'male':
-                        violations['Male Invigilator on Friday']['count'] += 1
-                        violations['Male Invigilator on Friday']['exams'].append(exam)
-
-        # Check number of invigilators
-        required_invigilators = (exam['Bilangan Pelajar'] + 29) // 30
-        if len(exam['Invigilators']) < required_invigilators:
-            violations['Insufficient Invigilators']['count'] += 2
-            violations['Insufficient Invigilators']['exams'].append(exam)
-
-        # Track invigilation counts
-        for invigilator in exam['Invigilators']:
-            invigilator_name = invigilator.split('(')[0].strip().lower()
-            if invigilator_name in invigilation_count:
-                invigilation_count[invigilator_name] += 1
+
+    decoded = {}
+
+    def record(constraint, exam_indices, weight):
+        # One entry per offending slot, as exam dicts in the display shape
+        for exam_idx in exam_indices.tolist():
+            if exam_idx not in decoded:
+                decoded[exam_idx] = problem.decode_exam(schedule, exam_idx)
+            violations[constraint]['count'] += weight
+            violations[constraint]['exams'].append(decoded[exam_idx])
+
+    # Check Ketua constraint
+    ketua = invigilators[problem.ketua_slots]
+    record('Ketua Not Pensyarah Kanan', np.flatnonzero((ketua < 0) | ~problem.is_senior[ketua]), 2)
+
+    # Check lecturer invigilating own exam
+    own_exam = problem.is_own_exam(problem.slot_exam, invigilators)
+    record('Lecturer Invigilating Own Exam', problem.slot_exam[own_exam], 2)
+
+    # Check male invigilators on Friday
+    friday_male = problem.is_friday[problem.slot_exam] & assigned & problem.is_male[invigilators]
+    record('Male Invigilator on Friday', problem.slot_exam[friday_male], 1)
+
+    # Check number of invigilators
+    assigned_per_exam = np.bincount(problem.slot_exam[assigned], minlength=problem.n_exams)
+    record('Insufficient Invigilators', np.flatnonzero(assigned_per_exam < problem.required_invigilators), 2)
 
     # Check invigilation count limits for each person
-    for name, count in invigilation_count.items():
-        role = data_invigilator[data_invigilator['Nama'].str.lower() == name]['Jawatan'].values[0].lower()
-        max_limit = 2 if 'pensyarah' in role else 1
-        if count > max_limit:
-            violations['Exceeded Invigilation Limit']['count'] += (count - max_limit)
-           
+    invigilation_count = np.bincount(invigilators[assigned], minlength=problem.n_staff)
+    violations['Exceeded Invigilation Limit']['count'] += int(np.maximum(invigilation_count - problem.limits, 0).sum())
+
+    # Check double bookings: every slot after a person's first in the same date and session
+    assigned_slots = np.flatnonzero(assigned)
+    keys = problem.slot_time_slot[assigned_slots] * problem.n_staff + invigilators[assigned_slots]
+    _, first = np.unique(keys, return_index=True)
+    clashing = np.delete(assigned_slots, first)
+    record('Invigilator Time Clash', problem.slot_exam[clashing], 2)
+
+    # Check hall capacity: every exam seated in a hall that is over capacity that session
+    record('Venue Over Capacity', np.flatnonzero(overfull_exams(problem, schedule.venues[None, :])[0]), 2)
 
     return violations
+
+# Generation Statistics
+def generation_stats(generation, population, fitness_scores, best_fitness, timer, wall_seconds, problem,
+                     mutation_rate=0.0, diversity=None):
+    """Statistics handed to observers' ``on_generation`` after each generation."""
+    current_best_idx = int(np.argmin(fitness_scores))
+    best = population[current_best_idx]
+    breakdown = penalty_terms(best.invigilators[None, :], problem, best.venues[None, :])[0]
+    evaluate_seconds = timer.seconds['evaluate']
+    return {
+        'generation': generation,
+        'wall_seconds': wall_seconds,
+        'phase_seconds': {phase: timer.seconds[phase] for phase in PHASES},
+        'evaluations': timer.evaluations,
+        'evals_per_sec': timer.evaluations / evaluate_seconds if evaluate_seconds else None,
+        'best_fitness': best_fitness,
+        'generation_best_fitness': int(fitness_scores[current_best_idx]),
+        'mean_fitness': float(fitness_scores.mean()),
+        'fitness_std': float(fitness_scores.std()),
+        'unique_fitness': int(np.unique(fitness_scores).size),
+        'gene_diversity': population_diversity(population, fitness_scores) if diversity is None else diversity,
+        'mutation_rate': mutation_rate,
+        'penalties': dict(zip(PENALTY_NAMES, breakdown.tolist())),
+    }
+
 # Main Genetic Algorithm
-def genetic_algorithm(population, data_exam, data_invigilator, num_generations=30, target_fitness=0):
+def genetic_algorithm(population, data_exam, data_invigilator, num_generations=30, target_fitness=0, problem=None,
+                      on_generation=None, observers=(), repair_budget=0.0, repair_count=1, config=None, rng=None):
+    """Evolve ``population`` and return ``(best_schedule, best_fitness, best_violations)``."""
+    problem = problem or population[0].problem
+    if config is None:
+        config = GAConfig(num_generations=num_generations, target_fitness=target_fitness,
+                          repair_budget=repair_budget, repair_count=repair_count)
+    rng = as_rng(rng)
+    deadline = None if config.time_budget is None else perf_counter() + config.time_budget
+    elite_size = min(config.elite_size, len(population))
+    mutation_rate = config.mutation_rate
+
     best_schedule = None
     best_fitness = float('inf')
     best_violations = None
     generations_without_improvement = 0
-    max_generations_without_improvement = 10
 
-    for generation in range(num_generations):
-        # Create new generation
-        population = create_new_generation(population, data_exam, data_invigilator)
-        
-        # Evaluate population
-        fitness_scores = [calculate_fitness(schedule, data_exam, data_invigilator) for schedule in population]
-        current_best_idx = fitness_scores.index(min(fitness_scores))
-        current_best_fitness = fitness_scores[current_best_idx]
-        
-        if current_best_fitness < best_fitness:
-            best_fitness = current_best_fitness
-            best_schedule = population[current_best_idx]
-            best_violations = check_constraints(best_schedule, data_exam, data_invigilator)
-            generations_without_improvement = 0
-        else:
-            generations_without_improvement += 1
-        
-        if best_fitness <= target_fitness or generations_without_improvement >= max_generations_without_improvement:
-            break
+    for observer in observers:
+        observer.on_start(problem, population)
+
+    try:
+        for generation in range(config.num_generations):
+            generation_start = perf_counter()
+            timer = GenerationTimer() if observers else None
+
+            # Create new generation
+            population = create_new_generation(
+                population, data_exam, data_invigilator, elite_size=elite_size, problem=problem,
+                tournament_size=config.tournament_size, mutation_rate=mutation_rate, timer=timer,
+                repair_budget=config.repair_budget, repair_count=config.repair_count,
+                crossover=config.crossover, mutation=config.mutation, rng=rng
+            )
+            
+            # Evaluate population; elites keep their cached scores
+            fitness_scores = evaluate_population(population, problem, timer)
+            current_best_idx = int(np.argmin(fitness_scores))
+            current_best_fitness = int(fitness_scores[current_best_idx])
+            
+            if current_best_fitness < best_fitness:
+                best_fitness = current_best_fitness
+                # Copy-on-write snapshot, so later in-place moves cannot alter it
+                best_schedule = population[current_best_idx].copy()
+                best_violations = check_constraints(best_schedule, data_exam, data_invigilator, problem)
+                generations_without_improvement = 0
+            else:
+                generations_without_improvement += 1
+
+            # Raise the mutation rate as the population converges
+            diversity = None
+            if config.adaptive_mutation:
+                diversity = population_diversity(population, fitness_scores)
+
+            if observers:
+                stats = generation_stats(generation + 1, population, fitness_scores, best_fitness, timer,
+                                         perf_counter() - generation_start, problem, mutation_rate, diversity)
+                for observer in observers:
+                    observer.on_generation(stats)
+
+            if on_generation is not None:
+                on_generation(generation + 1, best_fitness)
+
+            if diversity is not None:
+                mutation_rate = config.mutation_rate_for(diversity)
+            
+            if (best_fitness - problem.venue_penalty <= config.target_fitness
+                    or generations_without_improvement >= config.patience
+                    or (deadline is not None and perf_counter() >= deadline)):
+                break
+    finally:
+        for observer in observers:
+            observer.on_finish(best_schedule, best_fitness, population)
 
     if best_violations is None and best_schedule is not None:
-        best_violations = check_constraints(best_schedule, data_exam, data_invigilator)
+        best_violations = check_constraints(best_schedule, data_exam, data_invigilator, problem)
 
         
 
@@ -0,0 +1,164 @@
+import hashlib
+import os
+import pickle
+from io import BytesIO
+
+import pandas as pd
+
+from atomic_files import atomic_write
+
+# Bump when the cleaning below changes, so stale cached frames are not reused
+CACHE_VERSION = 1
+
+EXAM_COLUMNS = ['Tarikh', 'Hari', 'Waktu', 'Kod Kursus', 'Kod Setara', 'Masa Mula', 'Masa Tamat', 'Jumlah Pelajar']
+INVIGILATOR_COLUMNS = ['Bil', 'No. Pekerja', 'Nama', 'Jawatan', 'Jantina']
+INVIGILATOR_SHEETS = ['STAFF(S)', 'LECTERUR(L & K)']
+SAMPLE_COLUMNS = ['Tarikh', 'Masa', 'Kod Kursus', 'Kod Program', 'Kumpulan', 'Bilangan Calon', 'Pensyarah', 'Tempat',
+                  'Pengawas', 'Unused']
+
+
+class InputError(ValueError):
+    """An uploaded workbook is unreadable or not in the expected layout."""
+
+
+def _read_sheets(data, sheet_names=None):
+    """Parse sheets from one workbook, opening it only once.
+
+    ``pd.ExcelFile`` loads .xlsx files through openpyxl in read-only mode, so
+    rows are streamed rather than built into a full in-memory workbook.
+    """
+    with pd.ExcelFile(BytesIO(data)) as workbook:
+        if sheet_names is None:
+            return [workbook.parse(workbook.sheet_names[0], header=0)]
+        if not all(sheet in workbook.sheet_names for sheet in sheet_names):
+            raise InputError("Missing required worksheets in invigilator file.")
+        return [workbook.parse(sheet) for sheet in sheet_names]
+
+
+def parse_exam_data(data):
+    """Cleaned exam timetable from the DATA EXAM workbook bytes."""
+    try:
+        data_exam, = _read_sheets(data)
+        data_exam.columns = EXAM_COLUMNS
+    except Exception:
+        raise InputError("Error reading exam data file. Please check the format.")
+
+    data_exam['Tarikh'] = pd.to_datetime(data_exam['Tarikh'], errors='coerce')
+    data_exam.dropna(subset=['Tarikh', 'Kod Kursus'], inplace=True)
+    return data_exam
+
+
+def parse_invigilator_data(data):
+    """Staff and lecturer sheets of the DATA INVIGILATOR workbook, combined and cleaned."""
+    try:
+        staff_df, lecturer_df = _read_sheets(data, INVIGILATOR_SHEETS)
+        staff_df.columns = INVIGILATOR_COLUMNS
+        lecturer_df.columns = INVIGILATOR_COLUMNS
+    except InputError:
+        raise
+    except Exception:
+        raise InputError("Error reading invigilator data file. Please check the format.")
+
+    data_invigilator = pd.concat([staff_df, lecturer_df], ignore_index=True).drop(columns=['Bil'])
+    data_invigilator.dropna(subset=['Nama'], inplace=True)
+    data_invigilator['Nama'] = data_invigilator['Nama'].str.lower().str.strip()
+    return data_invigilator
+
+
+def parse_sample_schedule(data):
+    """Cleaned sample schedule from the CONTOH JADUAL workbook bytes."""
+    try:
+        contoh_jadual, = _read_sheets(data)
+    except Exception:
+        raise InputError("Error reading sample schedule file. Please check the format.")
+    if len(contoh_jadual.columns) != len(SAMPLE_COLUMNS):
+        raise InputError("Invalid sample schedule format.")
+    contoh_jadual.columns = SAMPLE_COLUMNS
+
+    contoh_jadual.drop(columns=['Pengawas', 'Unused'], inplace=True, errors='ignore')
+    contoh_jadual['Tarikh'] = pd.to_datetime(contoh_jadual['Tarikh'], errors='coerce')
+    contoh_jadual.dropna(subset=['Tarikh', 'Kod Kursus'], inplace=True)
+    return contoh_jadual
+
+
+PARSERS = {
+    'data_exam': parse_exam_data,
+    'data_invigilator': parse_invigilator_data,
+    'contoh_jadual': parse_sample_schedule,
+}
+
+
+def content_hash(kind, data):
+    """Cache key for one upload: its kind, the cleaning version and the file bytes."""
+    digest = hashlib.sha256(f"{kind}:{CACHE_VERSION}:".encode())
+    digest.update(data)
+    return digest.hexdigest()
+
+
+class InputCache:
+    """Parsed and cleaned upload DataFrames pickled on disk by content hash.
+
+    Re-uploading the same master staff list or sample schedule then skips
+    Excel parsing entirely. The oldest entries are removed once more than
+    ``max_entries`` are stored.
+    """
+
+    def __init__(self, directory, max_entries=256):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key):
+        try:
+            return pd.read_pickle(self._path(key))
+        except (FileNotFoundError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def put(self, key, frame):
+        atomic_write(self._path(key), lambda f: pickle.dump(frame, f, protocol=pickle.HIGHEST_PROTOCOL))
+        self._prune()
+
+    def _prune(self):
+        entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith('.pkl')]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+def load_input(kind, data, cache=None):
+    """Cleaned DataFrame for one upload ``kind`` (a ``PARSERS`` key) from its bytes."""
+    if cache is None:
+        return PARSERS[kind](data)
+
+    key = content_hash(kind, data)
+    frame = cache.get(key)
+    if frame is None:
+        frame = PARSERS[kind](data)
+        cache.put(key, frame)
+    return frame
+
+
+def load_inputs(data_exam, data_invigilator, contoh_jadual, cache=None):
+    """``(data_exam, data_invigilator, contoh_jadual)`` DataFrames from the three workbooks' bytes."""
+    return (
+        load_input('data_exam', data_exam, cache),
+        load_input('data_invigilator', data_invigilator, cache),
+        load_input('contoh_jadual', contoh_jadual, cache),
+    )
+
+
+def load_workbooks(exam_path, invigilator_path, sample_path, cache=None):
+    """Like ``load_inputs``, reading the three workbooks from file paths."""
+    contents = []
+    for path in (exam_path, invigilator_path, sample_path):
+        with open(path, 'rb') as f:
+            contents.append(f.read())
+    return load_inputs(*contents, cache=cache)
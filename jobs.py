@@ -0,0 +1,137 @@
+import json
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once a cancel has been requested."""
+
+
+class JobQueue:
+    """Background timetable generation tracked in a local SQLite database.
+
+    Jobs run on a thread pool inside the web process. Their status, progress
+    and result live in SQLite, so any worker process sharing the database can
+    poll or cancel them.
+    """
+
+    def __init__(self, db_path, max_workers=2):
+        self.db_path = db_path
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='timetable-job')
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    generation INTEGER NOT NULL DEFAULT 0,
+                    num_generations INTEGER,
+                    best_fitness INTEGER,
+                    cancel_requested INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    result TEXT
+                )
+            """)
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _update(self, job_id, **fields):
+        assignments = ', '.join(f"{column} = ?" for column in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", [*fields.values(), job_id])
+
+    def submit(self, func, *args, num_generations=None, **kwargs):
+        """Queue ``func(progress, *args, **kwargs)`` and return the new job ID.
+
+        ``progress(generation, best_fitness)`` records progress and raises
+        JobCancelled when the job has been cancelled. The function's return
+        value must be JSON serializable and becomes the job result.
+        """
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, created_at, num_generations) VALUES (?, 'queued', ?, ?)",
+                (job_id, time.time(), num_generations)
+            )
+        self._executor.submit(self._run, job_id, func, args, kwargs)
+        return job_id
+
+    def _run(self, job_id, func, args, kwargs):
+        if self._cancel_requested(job_id):
+            self._update(job_id, status='cancelled', finished_at=time.time())
+            return
+        self._update(job_id, status='running', started_at=time.time())
+
+        def progress(generation, best_fitness):
+            self._update(job_id, generation=generation, best_fitness=int(best_fitness))
+            if self._cancel_requested(job_id):
+                raise JobCancelled(job_id)
+
+        try:
+            result = func(progress, *args, **kwargs)
+        except JobCancelled:
+            self._update(job_id, status='cancelled', finished_at=time.time())
+        except Exception as e:
+            self._update(job_id, status='failed', error=str(e), finished_at=time.time())
+        else:
+            self._update(job_id, status='completed', finished_at=time.time(),
+                         result=json.dumps(result, default=str))
+
+    def _cancel_requested(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def cancel(self, job_id):
+        """Ask a queued or running job to stop. Returns False if it has already finished."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status IN ('queued', 'running')",
+                (job_id,)
+            )
+        return cursor.rowcount > 0
+
+    def status(self, job_id):
+        """Progress snapshot for a job, or None if the ID is unknown."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT status, created_at, started_at, finished_at, generation, num_generations, "
+                "best_fitness, cancel_requested, error FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        (status, created_at, started_at, finished_at, generation, num_generations,
+         best_fitness, cancel_requested, error) = row
+
+        # Upper bound: the GA may stop early on target fitness or stagnation
+        eta_seconds = None
+        if status == 'running' and started_at and generation and num_generations:
+            elapsed = time.time() - started_at
+            eta_seconds = round(elapsed / generation * (num_generations - generation), 1)
+
+        return {
+            'id': job_id,
+            'status': status,
+            'generation': generation,
+            'num_generations': num_generations,
+            'best_fitness': best_fitness,
+            'eta_seconds': eta_seconds,
+            'cancel_requested': bool(cancel_requested),
+            'error': error,
+            'created_at': created_at,
+            'started_at': started_at,
+            'finished_at': finished_at,
+        }
+
+    def result(self, job_id):
+        """Decoded result of a completed job, or None."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT result FROM jobs WHERE id = ? AND status = 'completed'", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
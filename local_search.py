@@ -0,0 +1,143 @@
+"""Constraint-repair local search over single invigilator slots.
+
+``repair`` is a min-conflicts hill climber with a short tabu list: it
+repeatedly visits slots that take part in some penalty and moves each to
+the staff member that lowers the fitness most, scoring every candidate in
+one numpy pass and applying the move through ``FitnessState``.
+"""
+import time
+
+import numpy as np
+
+from fitness_state import FitnessState
+from seeding import as_rng
+
+_BLOCKED = np.iinfo(np.int64).max
+
+
+def bitset_array(mask, size):
+    """Bool array of the bits set in a Python int bitset."""
+    bits = np.frombuffer(mask.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8)
+    return np.unpackbits(bits, bitorder='little')[:size].astype(bool)
+
+
+def candidate_penalties(state, slot):
+    """Penalty contributed by ``slot`` for every staff member who could hold it.
+
+    Differences between entries equal ``state.move_delta`` differences, so
+    the argmin is the best single move for the slot.
+    """
+    problem = state.problem
+    exam_idx = int(problem.slot_exam[slot])
+    time_slot = int(problem.exam_time_slot[exam_idx])
+    counts = np.asarray(state.counts)
+
+    penalties = np.zeros(problem.n_staff, dtype=np.int64)
+    if problem.slot_offsets[exam_idx] == slot:
+        penalties += 2 * ~problem.is_senior
+    penalties[problem.exam_lecturer_ids[exam_idx]] += 2
+    if problem.is_friday[exam_idx]:
+        penalties += problem.is_male
+    penalties += counts >= problem.limits
+    penalties += 2 * bitset_array(state.busy[time_slot], problem.n_staff)
+
+    current = int(state.genome.genes[slot])
+    if current >= 0:
+        # The holder's own duty is already in its counts
+        count, limit = state.counts[current], int(problem.limits[current])
+        penalties[current] += int(count > limit) - int(count >= limit)
+        penalties[current] += 2 * (state.bookings(time_slot, current) > 1) - 2
+    return penalties
+
+
+def best_staff(state, slot, rng, excluded=()):
+    """Least-penalty staff member for a slot, preferring the current holder, then light loads.
+
+    Nobody already in the slot's exam, or listed in ``excluded``, is considered.
+    """
+    problem = state.problem
+    exam_idx = int(problem.slot_exam[slot])
+    current = int(state.genome.genes[slot])
+    start, end = problem.slot_offsets[exam_idx], problem.slot_offsets[exam_idx + 1]
+    crew = [staff_id for staff_id in state.genome.genes.slice(start, end).tolist()
+            if staff_id >= 0 and staff_id != current]
+
+    penalties = candidate_penalties(state, slot)
+    penalties[crew] = _BLOCKED
+    penalties[list(excluded)] = _BLOCKED
+
+    candidates = np.flatnonzero(penalties == penalties.min())
+    if current in candidates:
+        return current
+    loads = np.asarray(state.counts)[candidates] - problem.limits[candidates]
+    lightest = candidates[loads == loads.min()]
+    return int(lightest[rng.randrange(len(lightest))])
+
+
+def conflicted_slots(problem, invigilators):
+    """Bool mask of the slots that take part in at least one penalty."""
+    assigned = invigilators >= 0
+    staff_ids = np.where(assigned, invigilators, 0)
+    slot_exam = problem.slot_exam
+
+    conflicted = problem.is_own_exam(slot_exam, invigilators)
+    ketua = problem.ketua_slots
+    conflicted[ketua] |= ~assigned[ketua] | ~problem.is_senior[staff_ids[ketua]]
+    conflicted |= problem.is_friday[slot_exam] & assigned & problem.is_male[staff_ids]
+
+    counts = np.bincount(invigilators[assigned], minlength=problem.n_staff)
+    conflicted |= assigned & (counts[staff_ids] > problem.limits[staff_ids])
+
+    keys = np.where(assigned, problem.slot_time_slot * problem.n_staff + staff_ids, -1 - np.arange(problem.n_slots))
+    _, inverse, key_counts = np.unique(keys, return_inverse=True, return_counts=True)
+    conflicted |= assigned & (key_counts[inverse] > 1)
+    return conflicted
+
+
+def repair(genome, time_budget=None, max_sweeps=10, tabu_tenure=10, rng=None, deadline=None):
+    """Improve ``genome`` in place by min-conflicts moves and return its new fitness.
+
+    Each sweep visits the conflicted slots in random order and takes the best
+    move for each one. Improving moves are always taken. Sideways moves are
+    taken too, but a staff member moved out of a slot may not return to it
+    for ``tabu_tenure`` steps. Stops after a sweep with no improvement, after
+    ``max_sweeps``, or at the deadline. The deadline is ``deadline`` if
+    given, otherwise ``time_budget`` seconds from now.
+    """
+    rng = as_rng(rng)
+    if deadline is None and time_budget is not None:
+        deadline = time.perf_counter() + time_budget
+
+    problem = genome.problem
+    state = FitnessState(genome)
+    tabu = {}  # slot -> {staff_id: step until which it may not return}
+    step = 0
+
+    for _ in range(max_sweeps):
+        if state.fitness == state.venue_penalty:
+            break
+        slots = np.flatnonzero(conflicted_slots(problem, genome.invigilators)).tolist()
+        rng.shuffle(slots)
+
+        improved = out_of_time = False
+        for slot in slots:
+            step += 1
+            current = int(genome.genes[slot])
+            slot_tabu = tabu.setdefault(slot, {})
+            excluded = [staff_id for staff_id, until in slot_tabu.items() if until > step]
+            staff_id = best_staff(state, slot, rng, excluded)
+            if staff_id != current:
+                delta = state.move_delta(slot, staff_id)
+                if delta <= 0:
+                    state.apply_move(slot, staff_id)
+                    if current >= 0:
+                        slot_tabu[current] = step + tabu_tenure
+                    improved |= delta < 0
+            if deadline is not None and time.perf_counter() > deadline:
+                out_of_time = True
+                break
+        if out_of_time or not improved:
+            break
+
+    state.commit()
+    return state.fitness
@@ -0,0 +1,196 @@
+"""Best-of-N restarts of a timetable engine on a process pool.
+
+A single GA run can settle in a local optimum and stop on patience;
+``multi_start`` runs ``restarts`` independently seeded runs concurrently
+and keeps the best. Each run records its seed, so any of them can be
+replayed alone with ``solvers.solve(engine, problem, ..., rng=seed)``.
+
+Command line::
+
+    python -m multi_start "DATA EXAM.xlsx" "DATA INVIGILATOR.xlsx" "CONTOH JADUAL BARU.xlsx" \\
+        --restarts 8 --seed 1 --time-budget 120 --output best.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+import parallel_ga
+from ga_config import GAConfig
+from ga_model import check_constraints
+from input_loader import InputError, load_workbooks
+from parallel_ga import _init_worker
+from problem_model import Genome, compile_problem
+from seeding import spawn_seeds
+from solvers import SOLVERS, solve
+
+
+class _Stopped(Exception):
+    """Raised inside a worker's GA once another restart has reached the target."""
+
+
+def _check_stop(generation, best_fitness):
+    if parallel_ga._STOP.is_set():
+        raise _Stopped()
+
+
+def _run_restart(engine, config, seed, deadline):
+    """One seeded run inside a worker: ``(status, seed, fitness, seconds, invigilators, venues)``.
+
+    ``deadline`` is wall-clock (``time.time``), shared by every restart.
+    """
+    if parallel_ga._STOP.is_set():
+        return 'cancelled', seed, None, 0.0, None, None
+    if deadline is not None:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return 'skipped', seed, None, 0.0, None, None
+        config = config.replace(time_budget=min(config.time_budget or remaining, remaining))
+
+    start = time.perf_counter()
+    try:
+        schedule, fitness, _ = solve(engine, parallel_ga._PROBLEM, None, None, config=config,
+                                     rng=random.Random(seed), on_generation=_check_stop)
+    except _Stopped:
+        return 'cancelled', seed, None, time.perf_counter() - start, None, None
+    return 'completed', seed, int(fitness), time.perf_counter() - start, schedule.invigilators, schedule.venues
+
+
+def _summary(runs, wall_seconds, target_fitness):
+    fitness = np.array([run['fitness'] for run in runs if run['status'] == 'completed'], dtype=np.int64)
+    summary = {
+        'restarts': len(runs),
+        'completed': int(fitness.size),
+        'cancelled': sum(run['status'] == 'cancelled' for run in runs),
+        'skipped': sum(run['status'] == 'skipped' for run in runs),
+        'wall_seconds': wall_seconds,
+        'runs': runs,
+    }
+    if fitness.size:
+        summary.update({
+            'best_fitness': int(fitness.min()),
+            'worst_fitness': int(fitness.max()),
+            'mean_fitness': float(fitness.mean()),
+            'median_fitness': float(np.median(fitness)),
+            'fitness_std': float(fitness.std()),
+            'reached_target': int(np.count_nonzero(fitness <= target_fitness)),
+        })
+    return summary
+
+
+def multi_start(data_exam, data_invigilator, contoh_jadual=None, problem=None, restarts=8, config=None, rng=None,
+                engine='ga', max_workers=None, time_budget=None, on_restart=None):
+    """Run ``restarts`` seeded runs of ``engine`` concurrently and keep the best.
+
+    Returns ``(best_schedule, best_fitness, best_violations, summary)``;
+    the first three are as from ``genetic_algorithm`` and ``summary`` holds
+    the spread of final fitness across restarts plus each run's seed, status
+    and time. Seeds are child streams of ``rng`` (see ``seeding``).
+
+    ``time_budget`` (seconds) bounds the whole batch: every run is cut off
+    at it, and runs not started by then are skipped. As soon as one run
+    reaches ``config.target_fitness`` above the fixed ``problem.venue_penalty``,
+    queued runs are cancelled and running ones stop at their next
+    generation. ``on_restart(run)`` is called with each finished run's
+    summary entry.
+    """
+    if engine not in SOLVERS:
+        raise ValueError(f"engine must be one of {', '.join(SOLVERS)}")
+    config = config or GAConfig()
+    problem = problem or compile_problem(data_exam, data_invigilator, contoh_jadual)
+    if len(problem.leader_ids) == 0:
+        raise ValueError("No eligible Pensyarah Kanan found for Ketua assignment!")
+
+    start = time.perf_counter()
+    deadline = None if time_budget is None else time.time() + time_budget
+    seeds = spawn_seeds(rng, restarts)
+    max_workers = max_workers or min(restarts, os.cpu_count() or 1)
+    # The fixed hall-capacity penalty is out of reach of every restart
+    target_fitness = config.target_fitness + problem.venue_penalty
+
+    runs = []
+    best_genes = None
+    best_fitness = float('inf')
+    stop = multiprocessing.Event()
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(problem, stop)) as pool:
+        futures = {pool.submit(_run_restart, engine, config, seed, deadline): seed for seed in seeds}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                status, seed, fitness, seconds, invigilators, venues = future.result()
+                run = {'seed': seed, 'status': status, 'fitness': fitness, 'seconds': seconds}
+                runs.append(run)
+                if on_restart is not None:
+                    on_restart(run)
+                if status == 'completed' and fitness < best_fitness:
+                    best_fitness, best_genes = fitness, (invigilators, venues)
+            if best_fitness <= target_fitness and not stop.is_set():
+                stop.set()
+                for future in pending:
+                    if future.cancel():
+                        runs.append({'seed': futures[future], 'status': 'cancelled', 'fitness': None, 'seconds': 0.0})
+
+    summary = _summary(runs, time.perf_counter() - start, target_fitness)
+    if best_genes is None:
+        return None, best_fitness, None, summary
+    best_schedule = Genome(problem, *best_genes, fitness=best_fitness)
+    return best_schedule, best_fitness, check_constraints(best_schedule, data_exam, data_invigilator, problem), summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Best-of-N timetable restarts on a process pool.")
+    parser.add_argument('data_exam', help="DATA EXAM workbook")
+    parser.add_argument('data_invigilator', help="DATA INVIGILATOR workbook")
+    parser.add_argument('contoh_jadual', help="subject information workbook")
+    parser.add_argument('--restarts', type=int, default=8)
+    parser.add_argument('--engine', choices=sorted(SOLVERS), default='ga')
+    parser.add_argument('--seed', type=int, help="seed for the restart seeds; random when omitted")
+    parser.add_argument('--workers', type=int, help="worker processes, by default one per CPU")
+    parser.add_argument('--time-budget', type=float, help="seconds for the whole batch")
+    parser.add_argument('--population', type=int, default=100)
+    parser.add_argument('--generations', type=int, default=30)
+    parser.add_argument('--output', help="write the summary, violations and best timetable here as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        data_exam, data_invigilator, contoh_jadual = load_workbooks(args.data_exam, args.data_invigilator,
+                                                                   args.contoh_jadual)
+    except InputError as e:
+        parser.error(str(e))
+
+    config = GAConfig(population_size=args.population, elite_size=min(20, args.population),
+                      num_generations=args.generations)
+    best_schedule, best_fitness, violations, summary = multi_start(
+        data_exam, data_invigilator, contoh_jadual, restarts=args.restarts, config=config, rng=args.seed,
+        engine=args.engine, max_workers=args.workers, time_budget=args.time_budget,
+        on_restart=lambda run: print(f"seed {run['seed']}: {run['status']}, fitness {run['fitness']}, "
+                                     f"{run['seconds']:.1f}s")
+    )
+    if best_schedule is None:
+        print("No restart finished within the time budget.")
+        return 1
+    print(f"Best fitness {best_fitness} of {summary['completed']} completed restarts "
+          f"(mean {summary['mean_fitness']:.1f}, worst {summary['worst_fitness']}) in {summary['wall_seconds']:.1f}s")
+
+    if args.output:
+        report = {
+            'summary': summary,
+            'violations': {name: violation['count'] for name, violation in violations.items()},
+            'schedule': best_schedule.decode(),
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,172 @@
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ga_config import GAConfig
+from ga_model import _build_individual, check_constraints, create_new_generation, evaluate_population
+from problem_model import Genome
+from seeding import as_rng, spawn_seeds
+
+# Set once per worker process by the pool initializer
+_PROBLEM = None
+_STOP = None
+
+
+def _init_worker(problem, stop=None):
+    global _PROBLEM, _STOP
+    _PROBLEM = problem
+    _STOP = stop
+
+
+def _build_individuals(seeds):
+    return _pack([_build_individual(_PROBLEM, random.Random(seed)) for seed in seeds])
+
+
+def build_population_parallel(problem, seeds, max_workers):
+    """Build one individual per seed, spread over a process pool, in seed order."""
+    chunk_size = -(-len(seeds) // max_workers)
+    chunks = [seeds[start:start + chunk_size] for start in range(0, len(seeds), chunk_size)]
+    with ProcessPoolExecutor(max_workers=len(chunks), initializer=_init_worker, initargs=(problem,)) as pool:
+        packed = list(pool.map(_build_individuals, chunks))
+    return [schedule for chunk in packed for schedule in _unpack(problem, *chunk)]
+
+
+def _pack(population):
+    """Genes, venues and cached scores of a population as plain arrays for IPC."""
+    invigilators = np.stack([schedule.invigilators for schedule in population])
+    venues = np.stack([schedule.venues for schedule in population])
+    fitness = np.array([-1 if schedule.fitness is None else schedule.fitness for schedule in population])
+    return invigilators, venues, fitness
+
+
+def _unpack(problem, invigilators, venues, fitness):
+    return [
+        Genome(problem, invigilators[idx], venues[idx],
+               None if fitness[idx] < 0 else int(fitness[idx]))
+        for idx in range(len(invigilators))
+    ]
+
+
+def _evolve_island(invigilators, venues, fitness, settings, num_generations, target_fitness, seed):
+    """Run one island for ``num_generations`` inside a worker process."""
+    rng = random.Random(seed)
+    population = _unpack(_PROBLEM, invigilators, venues, fitness)
+
+    for _ in range(num_generations):
+        population = create_new_generation(population, None, None, problem=_PROBLEM, rng=rng, **settings)
+        if evaluate_population(population, _PROBLEM).min() <= target_fitness:
+            break
+
+    evaluate_population(population, _PROBLEM)
+    return _pack(population)
+
+
+def _migrate(islands, migration_size):
+    """Ring migration: each island's best replace the next island's worst."""
+    emigrants = []
+    for invigilators, venues, fitness in islands:
+        best = np.argsort(fitness, kind='stable')[:migration_size]
+        emigrants.append((invigilators[best], venues[best], fitness[best]))
+
+    for idx, (invigilators, venues, fitness) in enumerate(islands):
+        incoming_invigilators, incoming_venues, incoming_fitness = emigrants[idx - 1]
+        worst = np.argsort(fitness, kind='stable')[::-1][:len(incoming_fitness)]
+        invigilators[worst] = incoming_invigilators
+        venues[worst] = incoming_venues
+        fitness[worst] = incoming_fitness
+
+
+def parallel_genetic_algorithm(population, data_exam, data_invigilator, num_generations=30, target_fitness=0,
+                               problem=None, num_islands=4, migration_interval=5, migration_size=2,
+                               island_settings=None, max_workers=None, on_generation=None, repair_budget=0.0,
+                               config=None, rng=None):
+    """Island-model GA on a process pool.
+
+    The population is split into ``num_islands`` islands that evolve
+    independently, each with its own ``create_new_generation`` keyword
+    settings, and pass their best ``migration_size`` schedules round a ring
+    every ``migration_interval`` generations. The problem model is sent to
+    each worker once, when the pool starts; only gene arrays travel per
+    epoch. Returns ``(best_schedule, best_fitness, best_violations)`` like
+    ``genetic_algorithm``, and calls ``on_generation`` after each epoch.
+
+    ``config`` is a ``GAConfig`` (built from the keyword arguments when
+    omitted). Islands inherit its operators, rates and repair settings, with
+    the elite count scaled to the island size; the time budget and patience
+    are checked between epochs. Adaptive mutation is not applied on islands.
+
+    Every island epoch runs on its own child stream of ``rng`` (a seed or
+    generator), so a seeded run replays exactly whatever the worker count.
+    """
+    problem = problem or population[0].problem
+    rng = as_rng(rng)
+    if config is None:
+        config = GAConfig(num_generations=num_generations, target_fitness=target_fitness, repair_budget=repair_budget)
+    deadline = None if config.time_budget is None else time.perf_counter() + config.time_budget
+    # The fixed hall-capacity penalty is out of reach of the search
+    num_generations, target_fitness = config.num_generations, config.target_fitness + problem.venue_penalty
+
+    num_islands = max(1, min(num_islands, len(population)))
+    defaults = {
+        'tournament_size': config.tournament_size,
+        'mutation_rate': config.mutation_rate,
+        'crossover': config.crossover,
+        'mutation': config.mutation,
+        'repair_budget': config.repair_budget,
+        'repair_count': config.repair_count,
+    }
+    if island_settings is None:
+        island_size = len(population) // num_islands
+        island_elite = max(1, island_size * config.elite_size // config.population_size)
+        island_settings = [{'elite_size': island_elite}] * num_islands
+    island_settings = [dict(defaults, **settings) for settings in island_settings]
+
+    evaluate_population(population, problem)
+    islands = [_pack(population[idx::num_islands]) for idx in range(num_islands)]
+
+    best_schedule = None
+    best_fitness = float('inf')
+    generations_without_improvement = 0
+    generation = 0
+
+    max_workers = max_workers or min(num_islands, os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(problem,)) as pool:
+        while generation < num_generations:
+            epoch = min(migration_interval, num_generations - generation)
+            seeds = spawn_seeds(rng, num_islands)
+            futures = [
+                pool.submit(_evolve_island, *islands[idx], island_settings[idx], epoch, target_fitness, seeds[idx])
+                for idx in range(num_islands)
+            ]
+            islands = [future.result() for future in futures]
+            generation += epoch
+
+            # Track the global best across islands
+            island_idx, member_idx = min(
+                ((idx, int(np.argmin(fitness))) for idx, (_, _, fitness) in enumerate(islands)),
+                key=lambda pair: islands[pair[0]][2][pair[1]]
+            )
+            invigilators, venues, fitness = islands[island_idx]
+            if fitness[member_idx] < best_fitness:
+                best_fitness = int(fitness[member_idx])
+                best_schedule = Genome(problem, invigilators[member_idx], venues[member_idx],
+                                       best_fitness)
+                generations_without_improvement = 0
+            else:
+                generations_without_improvement += epoch
+
+            if on_generation is not None:
+                on_generation(generation, best_fitness)
+
+            if (best_fitness <= target_fitness or generations_without_improvement >= config.patience
+                    or (deadline is not None and time.perf_counter() >= deadline)):
+                break
+
+            if num_islands > 1 and migration_size > 0:
+                _migrate(islands, migration_size)
+
+    best_violations = check_constraints(best_schedule, data_exam, data_invigilator, problem) if best_schedule else None
+    return best_schedule, best_fitness, best_violations
@@ -0,0 +1,351 @@
+import numpy as np
+
+from venues import DEFAULT_VENUES, allocate_venues, overfull_exams
+
+# Genes per copy-on-write chunk
+CHUNK_SIZE = 64
+
+
+def _label_name(label):
+    """Strip the role marker from an invigilator label such as 'name (K)'."""
+    return label.split('(')[0].strip().lower()
+
+
+def _lecturer_tokens(lecturer_text):
+    return [lecturer.strip().lower() for lecturer in str(lecturer_text).split(',')]
+
+
+class ProblemModel:
+    """Integer-indexed view of the exam, invigilator and sample-schedule data.
+
+    Built once per upload so the GA loop never touches a DataFrame. Staff are
+    identified by their position in ``staff_names``; exams by their row
+    position in ``data_exam``.
+
+    Every exam owns a fixed run of invigilator slots in a genome: exam ``e``
+    uses slots ``slot_offsets[e]:slot_offsets[e + 1]`` and the first of them
+    is always the Ketua. How many it owns depends on the hall the exam is
+    given by ``venue_allocation``, packed once from the ``venues`` table.
+    """
+
+    def __init__(self, staff_names, jawatan, jantina, is_senior, exams, venues=DEFAULT_VENUES):
+        self.staff_names = staff_names
+        self.n_staff = len(staff_names)
+        self.staff_index = {name.lower(): idx for idx, name in enumerate(staff_names)}
+
+        roles = [str(role) for role in jawatan]
+        self.is_senior = np.array(is_senior, dtype=bool)
+        self.is_leader_eligible = np.array([role.strip().upper() == 'PENSYARAH KANAN' for role in roles], dtype=bool)
+        self.is_lecturer = np.array(['PENSYARAH' in role for role in roles], dtype=bool)
+        self.is_male = np.array([str(gender).strip().lower() == 'male' for gender in jantina], dtype=bool)
+        self.limits = np.array([2 if 'pensyarah' in role.lower() else 1 for role in roles], dtype=np.int64)
+        self.leader_ids = np.flatnonzero(self.is_leader_eligible)
+        self.senior_ids = np.flatnonzero(self.is_senior)
+
+        self.exams = exams
+        self.n_exams = len(exams)
+        self.is_friday = np.array([self.is_friday_day(exam['Hari']) for exam in exams], dtype=bool)
+
+        self._label_ids = {}
+        self._lecturer_ids = {}
+        self.exam_lecturer_ids = [self.lecturer_ids(exam['Lecturer']) for exam in exams]
+        self.exam_lecturer_masks = [sum(1 << staff_id for staff_id in ids) for ids in self.exam_lecturer_ids]
+
+        # Exams on the same date and session share a time slot; nobody can sit in two of them
+        time_slot_index = {}
+        self.exam_time_slot = np.array(
+            [time_slot_index.setdefault((exam['Tarikh'], exam['Masa']), len(time_slot_index)) for exam in exams],
+            dtype=np.int64
+        )
+        self.n_time_slots = len(time_slot_index)
+
+        # Halls, filled session by session; each exam's invigilator count follows its hall
+        self.venues = tuple(venues)
+        self.venue_names = [venue.name for venue in self.venues]
+        self.n_venues = len(self.venues)
+        self.venue_capacity = np.array(
+            [np.iinfo(np.int64).max if venue.capacity is None else venue.capacity for venue in self.venues],
+            dtype=np.int64
+        )
+        self.exam_students = np.array([int(exam['Bilangan Pelajar']) for exam in exams], dtype=np.int64)
+        self.venue_allocation = allocate_venues(self.exam_students, self.exam_time_slot, self.n_time_slots,
+                                                self.venues)
+        self.required_invigilators = np.array(
+            [self.venues[venue_id].invigilators_for(students)
+             for venue_id, students in zip(self.venue_allocation.tolist(), self.exam_students.tolist())],
+            dtype=np.int64
+        )
+        # Hall-capacity penalty of the fixed allocation; no move can change it
+        self.venue_penalty = 2 * int(np.count_nonzero(overfull_exams(self, self.venue_allocation[None, :])))
+
+        # Slot layout shared by every genome
+        slot_counts = np.maximum(self.required_invigilators, 1)
+        self.slot_offsets = np.concatenate(([0], np.cumsum(slot_counts))).astype(np.int64)
+        self.n_slots = int(self.slot_offsets[-1])
+        self.ketua_slots = self.slot_offsets[:-1]
+        self.slot_exam = np.repeat(np.arange(self.n_exams), slot_counts)
+
+        # Exam dates, for operators that keep a whole day's assignments together
+        day_index = {}
+        self.exam_day = np.array([day_index.setdefault(exam['Tarikh'], len(day_index)) for exam in exams],
+                                 dtype=np.int64)
+        self.n_days = len(day_index)
+
+        # Time slot of every invigilator slot, and the exams of each time slot
+        self.slot_time_slot = self.exam_time_slot[self.slot_exam]
+        self.time_slot_exams = [[] for _ in range(self.n_time_slots)]
+        for exam_idx, time_slot in enumerate(self.exam_time_slot.tolist()):
+            self.time_slot_exams[time_slot].append(exam_idx)
+
+        # (exam, staff) pairs where the staff member lectures the exam, as sorted flat keys
+        own_exam_keys = [
+            exam_idx * self.n_staff + staff_id
+            for exam_idx, ids in enumerate(self.exam_lecturer_ids)
+            for staff_id in ids
+        ]
+        self.own_exam_keys = np.array(sorted(own_exam_keys), dtype=np.int64)
+
+    @staticmethod
+    def is_friday_day(hari):
+        return str(hari).strip().lower() == 'jumaat'
+
+    def staff_id(self, label):
+        """Staff ID for an invigilator label, or -1 if the name is unknown."""
+        staff_id = self._label_ids.get(label)
+        if staff_id is None:
+            staff_id = self.staff_index.get(_label_name(label), -1)
+            self._label_ids[label] = staff_id
+        return staff_id
+
+    def lecturer_ids(self, lecturer_text):
+        """Sorted staff IDs named in an exam's comma-separated lecturer list."""
+        ids = self._lecturer_ids.get(lecturer_text)
+        if ids is None:
+            ids = sorted({
+                self.staff_index[token] for token in _lecturer_tokens(lecturer_text)
+                if token in self.staff_index
+            })
+            self._lecturer_ids[lecturer_text] = ids
+        return ids
+
+    def is_own_exam(self, exam_idx, staff_ids):
+        """Elementwise test of whether each staff ID lectures the matching exam."""
+        staff_ids = np.asarray(staff_ids)
+        keys = np.asarray(exam_idx) * self.n_staff + staff_ids
+        if len(self.own_exam_keys) == 0:
+            return np.zeros(keys.shape, dtype=bool)
+        pos = np.minimum(np.searchsorted(self.own_exam_keys, keys), len(self.own_exam_keys) - 1)
+        return (self.own_exam_keys[pos] == keys) & (staff_ids >= 0)
+
+    def time_slot_staff(self, genome, time_slot):
+        """Staff IDs assigned to any exam of one time slot, -1 for empty slots."""
+        return np.concatenate([
+            genome.genes.slice(self.slot_offsets[exam_idx], self.slot_offsets[exam_idx + 1])
+            for exam_idx in self.time_slot_exams[time_slot]
+        ])
+
+    def label(self, staff_id, is_leader=False):
+        name = self.staff_names[staff_id]
+        if is_leader:
+            return f"{name} (K)"
+        elif self.is_lecturer[staff_id]:
+            return f"{name} (L)"
+        else:
+            return f"{name} (S)"
+
+    def decode_exam(self, genome, exam_idx):
+        """Rebuild the exam dict shape used by app.py for one exam of a genome."""
+        start, end = self.slot_offsets[exam_idx], self.slot_offsets[exam_idx + 1]
+        staff_ids = genome.genes.slice(start, end)
+        exam = dict(self.exams[exam_idx])
+        exam['Tempat'] = self.venue_names[genome.venue_genes[exam_idx]]
+        exam['Invigilators'] = [
+            self.label(staff_id, is_leader=(slot == 0))
+            for slot, staff_id in enumerate(staff_ids.tolist()) if staff_id >= 0
+        ]
+        return exam
+
+    def decode(self, genome):
+        return [self.decode_exam(genome, exam_idx) for exam_idx in range(self.n_exams)]
+
+
+class CowArray:
+    """Fixed-length int array stored as copy-on-write chunks.
+
+    Chunks are shared between arrays by reference. A chunk's writeable flag
+    marks it as owned by a single array; sharing it clears the flag, and the
+    next write to a read-only chunk copies just that chunk first. Writes can
+    therefore never leak into another array that shares the data.
+    """
+
+    __slots__ = ('chunks', 'length')
+
+    def __init__(self, chunks, length):
+        self.chunks = chunks
+        self.length = length
+
+    @classmethod
+    def from_array(cls, values):
+        values = np.asarray(values)
+        chunks = [values[start:start + CHUNK_SIZE].copy() for start in range(0, len(values), CHUNK_SIZE)]
+        return cls(chunks, len(values))
+
+    @staticmethod
+    def _share(chunks):
+        for chunk in chunks:
+            chunk.flags.writeable = False
+        return chunks
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, idx):
+        return self.chunks[idx // CHUNK_SIZE][idx % CHUNK_SIZE]
+
+    def __setitem__(self, idx, value):
+        chunk_idx = idx // CHUNK_SIZE
+        chunk = self.chunks[chunk_idx]
+        if not chunk.flags.writeable:
+            chunk = chunk.copy()
+            self.chunks[chunk_idx] = chunk
+        chunk[idx % CHUNK_SIZE] = value
+
+    def to_array(self, out=None):
+        if not self.chunks:
+            return np.empty(0, dtype=np.int64) if out is None else out
+        return np.concatenate(self.chunks, out=out)
+
+    def slice(self, start, end):
+        first, last = start // CHUNK_SIZE, (end - 1) // CHUNK_SIZE
+        if first == last:
+            return self.chunks[first][start % CHUNK_SIZE:start % CHUNK_SIZE + end - start]
+        return np.concatenate(self.chunks[first:last + 1])[start - first * CHUNK_SIZE:end - first * CHUNK_SIZE]
+
+    def copy(self):
+        return CowArray(self._share(list(self.chunks)), self.length)
+
+    def splice(self, other, cut):
+        """Elements before ``cut`` from self and the rest from other, sharing whole chunks."""
+        chunk_idx, offset = divmod(cut, CHUNK_SIZE)
+        head = self._share(self.chunks[:chunk_idx])
+        if offset == 0:
+            return CowArray(head + self._share(other.chunks[chunk_idx:]), self.length)
+        mixed = np.concatenate((self.chunks[chunk_idx][:offset], other.chunks[chunk_idx][offset:]))
+        return CowArray(head + [mixed] + self._share(other.chunks[chunk_idx + 1:]), self.length)
+
+
+def population_nbytes(population):
+    """Bytes of gene data held by a population, counting shared chunks once."""
+    seen = {}
+    for genome in population:
+        for chunk in genome.genes.chunks + genome.venue_genes.chunks:
+            seen[id(chunk)] = chunk.nbytes
+    return sum(seen.values())
+
+
+class Genome:
+    """One timetable: a staff ID per invigilator slot and a venue ID per exam.
+
+    Empty slots hold -1. Exam metadata lives on the shared ProblemModel.
+    Genes are copy-on-write, so children share unchanged chunks with their
+    parents and a write only ever copies the chunk it touches. Use
+    ``set_slot``/``set_venue`` to change genes; they also clear the cached
+    ``fitness``.
+    """
+
+    __slots__ = ('problem', 'genes', 'venue_genes', 'fitness')
+
+    def __init__(self, problem, invigilators, venues, fitness=None):
+        self.problem = problem
+        self.genes = invigilators if isinstance(invigilators, CowArray) else CowArray.from_array(invigilators)
+        self.venue_genes = venues if isinstance(venues, CowArray) else CowArray.from_array(venues)
+        self.fitness = fitness
+
+    def __len__(self):
+        return self.problem.n_exams
+
+    @property
+    def invigilators(self):
+        """Flat read-only snapshot of the staff ID per slot."""
+        invigilators = self.genes.to_array()
+        invigilators.flags.writeable = False
+        return invigilators
+
+    @property
+    def venues(self):
+        venues = self.venue_genes.to_array()
+        venues.flags.writeable = False
+        return venues
+
+    def set_slot(self, slot, staff_id):
+        self.genes[slot] = staff_id
+        self.fitness = None
+
+    def set_venue(self, exam_idx, venue_id):
+        self.venue_genes[exam_idx] = venue_id
+        self.fitness = None
+
+    def copy(self):
+        return Genome(self.problem, self.genes.copy(), self.venue_genes.copy(), self.fitness)
+
+    def splice(self, other, exam_idx):
+        """Child taking exams before ``exam_idx`` from self and the rest from other."""
+        cut = int(self.problem.slot_offsets[exam_idx])
+        return Genome(
+            self.problem,
+            self.genes.splice(other.genes, cut),
+            self.venue_genes.splice(other.venue_genes, exam_idx),
+        )
+
+    def decode(self):
+        return self.problem.decode(self)
+
+
+def compile_problem(data_exam, data_invigilator, contoh_jadual=None, venues=DEFAULT_VENUES):
+    """Compile the uploaded DataFrames into a ProblemModel.
+
+    Staff with the same (case-insensitive) name share one ID; their role and
+    gender come from the first record, as the DataFrame lookups did. Without
+    ``contoh_jadual`` every exam's lecturer is 'Unknown'. ``venues`` is the
+    hall table exams are allocated to.
+    """
+    data_invigilator = data_invigilator.dropna(subset=['Nama'])
+
+    staff_names = []
+    jawatan = []
+    jantina = []
+    senior_names = set()
+    seen = set()
+    for name, role, gender in zip(data_invigilator['Nama'], data_invigilator['Jawatan'],
+                                  data_invigilator['Jantina']):
+        key = name.lower()
+        if 'pensyarah kanan' in str(role).lower():
+            senior_names.add(key)
+        if key in seen:
+            continue
+        seen.add(key)
+        staff_names.append(name)
+        jawatan.append(role)
+        jantina.append(gender)
+
+    lecturers_by_course = {}
+    if contoh_jadual is not None:
+        for course, group in contoh_jadual.groupby('Kod Kursus', sort=False):
+            lecturers_by_course[course] = group['Pensyarah'].unique()
+
+    exams = []
+    for row in data_exam.to_dict('records'):
+        lecturers = lecturers_by_course.get(row['Kod Kursus'], [])
+        exams.append({
+            'Tarikh': row['Tarikh'],
+            'Hari': row['Hari'],
+            'Waktu': row['Waktu'],
+            'Kod Kursus': row['Kod Kursus'],
+            'Masa': f"{row['Masa Mula']} - {row['Masa Tamat']}",
+            'Bilangan Pelajar': row['Jumlah Pelajar'],
+            'Lecturer': ', '.join(lecturers) if len(lecturers) > 0 else 'Unknown',
+        })
+
+    # A name counts as senior if any of its records is, matching the old set lookup
+    is_senior = [name.lower() in senior_names for name in staff_names]
+    return ProblemModel(staff_names, jawatan, jantina, is_senior, exams, venues)
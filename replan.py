@@ -0,0 +1,137 @@
+"""Incremental re-planning of a published timetable after small input edits.
+
+A stored timetable (the ``format_schedule`` rows kept in the result store)
+is mapped onto the newly compiled problem. Only exams that are new, moved,
+resized or re-assigned to different lecturers, and slots whose invigilator
+has left the staff list, are re-filled; every other assignment is kept
+unless moving it strictly lowers the penalty of an overloaded or
+double-booked invigilator.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from fitness_state import FitnessState
+from ga_model import check_constraints
+from local_search import best_staff
+from problem_model import Genome
+from seeding import as_rng
+from timetable_export import split_invigilators
+
+
+def _exam_date(value):
+    return value.strftime('%Y-%m-%d') if isinstance(value, pd.Timestamp) else str(value)
+
+
+def _previous_rows(previous_schedule):
+    """Previous rows indexed by (course, date, time) and by course alone."""
+    by_slot, by_course = {}, {}
+    for row in previous_schedule:
+        by_slot.setdefault((row['Course Code'], str(row['Date']), row['Time']), row)
+        by_course.setdefault(row['Course Code'], row)
+    return by_slot, by_course
+
+
+def encode_schedule(problem, previous_schedule):
+    """Map stored timetable rows onto ``problem``.
+
+    Returns ``(genome, affected)``: a genome holding every assignment that
+    still applies, and a bool array marking exams that must be re-planned
+    because they are new, moved, resized, have different lecturers or lost
+    an invigilator who is no longer on the staff list. Venues are those of
+    the problem's allocation, which only changes in sessions whose exams
+    changed.
+    """
+    by_slot, by_course = _previous_rows(previous_schedule)
+    invigilators = np.full(problem.n_slots, -1, dtype=np.int32)
+    venues = problem.venue_allocation.copy()
+    affected = np.zeros(problem.n_exams, dtype=bool)
+
+    for exam_idx, exam in enumerate(problem.exams):
+        key = (exam['Kod Kursus'], _exam_date(exam['Tarikh']), exam['Masa'])
+        row = by_slot.get(key)
+        if row is None:
+            # New exam, or one moved to another date or session: start from its old crew if any
+            row = by_course.get(exam['Kod Kursus'])
+            affected[exam_idx] = True
+            if row is None:
+                continue
+        if str(row.get('Lecturer(s)')) != str(exam['Lecturer']):
+            affected[exam_idx] = True
+        if str(row.get('Number of Students')) != str(exam['Bilangan Pelajar']):
+            affected[exam_idx] = True
+
+        start, end = problem.slot_offsets[exam_idx], problem.slot_offsets[exam_idx + 1]
+        labels = split_invigilators(row.get('Invigilator(s)'))
+        slot = start
+        if labels and not labels[0].endswith('(K)'):
+            # The previous Ketua slot was empty
+            slot += 1
+        for label in labels:
+            if slot >= end:
+                affected[exam_idx] = True
+                break
+            staff_id = problem.staff_id(label)
+            if staff_id < 0:
+                affected[exam_idx] = True
+            invigilators[slot] = staff_id
+            slot += 1
+        if slot < end:
+            affected[exam_idx] = True
+
+    return Genome(problem, invigilators, venues), affected
+
+
+def replan(problem, previous_schedule, data_exam, data_invigilator, time_budget=None, max_passes=3, rng=None):
+    """Re-plan only what the input edits touched.
+
+    Affected exams are re-filled first, then slots held by invigilators over
+    their limit or booked twice in a session are moved only if that strictly
+    lowers the fitness. Stops
+    early once ``time_budget`` seconds have passed. Returns
+    ``(best_schedule, best_fitness, best_violations)`` like
+    ``genetic_algorithm``.
+    """
+    rng = as_rng(rng)
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+
+    genome, affected = encode_schedule(problem, previous_schedule)
+    state = FitnessState(genome)
+
+    # Slots of affected exams, Ketua first so seniors go where they are required
+    free_slots = np.flatnonzero(affected[problem.slot_exam])
+    free_slots = sorted(free_slots.tolist(), key=lambda slot: problem.slot_offsets[problem.slot_exam[slot]] != slot)
+    for slot in free_slots:
+        state.apply_move(slot, best_staff(state, slot, rng))
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+
+    # Relieve overloaded and double-booked staff, only where the move is a strict improvement
+    for _ in range(max_passes):
+        improved = False
+        invigilators = genome.invigilators
+        overloaded = [staff_id for staff_id, count in enumerate(state.counts) if count > problem.limits[staff_id]]
+        clashing = np.array([state.bookings(time_slot, staff_id) > 1 if staff_id >= 0 else False
+                             for time_slot, staff_id in zip(problem.slot_time_slot.tolist(), invigilators.tolist())],
+                            dtype=bool)
+        for slot in np.flatnonzero(np.isin(invigilators, overloaded) | clashing).tolist():
+            staff_id = best_staff(state, slot, rng)
+            if state.move_delta(slot, staff_id) < 0:
+                state.apply_move(slot, staff_id)
+                improved = True
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+        if not improved or (deadline is not None and time.perf_counter() > deadline):
+            break
+
+    state.commit()
+    return genome, state.fitness, check_constraints(genome, data_exam, data_invigilator, problem)
+
+
+def changed_exams(previous_schedule, schedule):
+    """Course codes whose date, time, venue or invigilators differ between two formatted timetables."""
+    fields = ('Date', 'Time', 'Venue', 'Invigilator(s)')
+    before = {row['Course Code']: tuple(str(row.get(field)) for field in fields) for row in previous_schedule}
+    return [row['Course Code'] for row in schedule
+            if before.get(row['Course Code']) != tuple(str(row.get(field)) for field in fields)]
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from atomic_files import atomic_write
+from ga_metrics import GAObserver
+from problem_model import Genome
+
+
+def frame_hash(frame):
+    """Content hash of a cleaned DataFrame: column names, dtypes and values."""
+    digest = hashlib.sha256(json.dumps([list(map(str, frame.columns)), list(map(str, frame.dtypes))]).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def input_key(data_exam, data_invigilator, contoh_jadual):
+    """Key shared by every run on the same three cleaned inputs."""
+    digest = hashlib.sha256()
+    for frame in (data_exam, data_invigilator, contoh_jadual):
+        digest.update(frame_hash(frame).encode())
+    return digest.hexdigest()
+
+
+def run_key(inputs_key, params, seed=None):
+    """Key of one run: its inputs, GA parameters and seed."""
+    payload = json.dumps({'inputs': inputs_key, 'params': params, 'seed': seed}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """Content-addressed memo of finished GA runs, plus their elite genomes.
+
+    ``<run key>.json`` maps a run to its ``ResultStore`` ID so a repeated
+    request returns immediately. ``<input key>.npz`` holds the best genomes
+    found for a set of inputs, for seeding later runs. Least recently used
+    files are evicted once the directory grows past ``max_bytes``.
+    """
+
+    def __init__(self, directory, max_bytes=64 * 2 ** 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def _write(self, path, write):
+        atomic_write(path, write)
+        self._evict()
+
+    def _touch(self, path):
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.tmp'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def lookup(self, key):
+        """Cached run summary (``result_id``, ``fitness``) for a run key, or None."""
+        path = self._path(key, '.json')
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        self._touch(path)
+        return entry
+
+    def remember(self, key, result_id, fitness):
+        payload = json.dumps({'result_id': result_id, 'fitness': fitness}).encode()
+        self._write(self._path(key, '.json'), lambda f: f.write(payload))
+
+    def save_elites(self, key, genomes):
+        """Store the genes of ``genomes`` (best first) for the inputs ``key``."""
+        if not genomes:
+            return
+        arrays = {
+            'invigilators': np.stack([genome.invigilators for genome in genomes]),
+            'venues': np.stack([genome.venues for genome in genomes]),
+            'fitness': np.array([-1 if genome.fitness is None else genome.fitness for genome in genomes]),
+        }
+        self._write(self._path(key, '.npz'), lambda f: np.savez(f, **arrays))
+
+    def load_elites(self, key, problem):
+        """Genomes stored for the inputs ``key``, rebuilt against ``problem``."""
+        path = self._path(key, '.npz')
+        try:
+            with np.load(path) as arrays:
+                invigilators, venues, fitness = arrays['invigilators'], arrays['venues'], arrays['fitness']
+        except (FileNotFoundError, ValueError, OSError):
+            return []
+        if invigilators.ndim != 2 or invigilators.shape[1] != problem.n_slots or venues.shape[1] != problem.n_exams:
+            return []
+        if not (venues == problem.venue_allocation).all():
+            # Saved under another venue table, so slot counts and scores no longer apply
+            return []
+        self._touch(path)
+        return [Genome(problem, row, venue_row, None if score < 0 else int(score))
+                for row, venue_row, score in zip(invigilators, venues, fitness.tolist())]
+
+
+class EliteRecorder(GAObserver):
+    """Keeps the ``size`` best distinct genomes of the final population."""
+
+    def __init__(self, size=10):
+        self.size = size
+        self.elites = []
+
+    def on_finish(self, best_schedule, best_fitness, population):
+        scored = [genome for genome in population if genome.fitness is not None]
+        scored.sort(key=lambda genome: genome.fitness)
+        if best_schedule is not None:
+            scored.insert(0, best_schedule)
+
+        seen = set()
+        self.elites = []
+        for genome in scored:
+            signature = genome.invigilators.tobytes() + genome.venues.tobytes()
+            if signature in seen:
+                continue
+            seen.add(signature)
+            self.elites.append(genome)
+            if len(self.elites) == self.size:
+                break
@@ -0,0 +1,64 @@
+import json
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+
+from atomic_files import atomic_write_bytes
+
+_RESULT_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+class ResultStore:
+    """Generated timetables kept on disk as JSON, keyed by result ID.
+
+    A small in-memory LRU cache sits in front of the files so repeated
+    dashboard and export requests for the same result skip disk reads.
+    """
+
+    def __init__(self, directory, cache_size=32):
+        self.directory = directory
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, result_id):
+        return os.path.join(self.directory, f"{result_id}.json")
+
+    def _remember(self, result_id, result):
+        with self._lock:
+            self._cache[result_id] = result
+            self._cache.move_to_end(result_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def save(self, result):
+        """Persist a JSON-serializable result and return its new ID."""
+        result_id = uuid.uuid4().hex
+        payload = json.dumps(result, default=str)
+
+        atomic_write_bytes(self._path(result_id), payload.encode('utf-8'))
+
+        self._remember(result_id, json.loads(payload))
+        return result_id
+
+    def load(self, result_id):
+        """Stored result for an ID, or None if it is unknown or malformed."""
+        if not result_id or not _RESULT_ID.match(result_id):
+            return None
+
+        with self._lock:
+            if result_id in self._cache:
+                self._cache.move_to_end(result_id)
+                return self._cache[result_id]
+
+        try:
+            with open(self._path(result_id), encoding='utf-8') as f:
+                result = json.load(f)
+        except FileNotFoundError:
+            return None
+
+        self._remember(result_id, result)
+        return result
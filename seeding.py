@@ -0,0 +1,29 @@
+"""Random streams for reproducible runs.
+
+GA entry points take an ``rng`` that may be a seed, a ``random.Random``,
+a NumPy ``Generator``, or None for the shared ``random`` module. ``as_rng``
+turns any of these into an object with the ``random.Random`` methods;
+``spawn_seeds`` derives independent child seeds for islands, workers and
+multi-start runs, so a run with a given seed replays exactly however its
+work is spread.
+"""
+import random
+
+import numpy as np
+
+
+def as_rng(rng=None):
+    """A ``random.Random``-like generator for a seed, generator or None."""
+    if rng is None or rng is random or isinstance(rng, random.Random):
+        return random if rng is None else rng
+    if isinstance(rng, np.random.Generator):
+        return random.Random(int(rng.integers(2 ** 63)))
+    if isinstance(rng, (int, np.integer)):
+        return random.Random(int(rng))
+    raise TypeError(f"rng must be a seed, random.Random or numpy Generator, not {type(rng).__name__}")
+
+
+def spawn_seeds(rng, count):
+    """``count`` 64-bit seeds for independent child streams drawn from ``rng``."""
+    entropy = as_rng(rng).getrandbits(128)
+    return [int(child.generate_state(1, np.uint64)[0]) for child in np.random.SeedSequence(entropy).spawn(count)]
@@ -0,0 +1,216 @@
+"""Interchangeable timetable engines.
+
+Every solver takes a compiled ``ProblemModel`` plus the cleaned exam and
+invigilator DataFrames and returns ``(best_schedule, best_fitness,
+best_violations)`` like ``genetic_algorithm``, so callers can pick an engine
+by name from ``SOLVERS``:
+
+- ``ga``: the genetic algorithm, from a fresh population.
+- ``greedy``: fills slots scarcest first with the least-penalty staff
+  member, then runs the min-conflicts ``repair`` on the result.
+- ``cp_sat``: an exact model for Google OR-Tools' CP-SAT solver, warm
+  started from the greedy schedule. OR-Tools is optional; without it this
+  engine raises ``SolverUnavailable``.
+"""
+import time
+
+import numpy as np
+
+from fitness_state import FitnessState
+from ga_config import GAConfig
+from ga_model import check_constraints, genetic_algorithm, initialize_population
+from local_search import best_staff, repair
+from problem_model import Genome
+from seeding import as_rng
+
+# Seconds the exact solver may run when the config sets no time budget
+DEFAULT_CP_SAT_TIME = 60.0
+# Share of the exact solver's budget spent repairing its greedy hint
+CP_SAT_HINT_SHARE = 0.25
+
+
+class SolverUnavailable(RuntimeError):
+    """The requested engine needs a package that is not installed."""
+
+
+def _finish(genome, data_exam, data_invigilator, problem, on_generation):
+    fitness = FitnessState(genome).fitness
+    if on_generation is not None:
+        on_generation(1, fitness)
+    return genome, fitness, check_constraints(genome, data_exam, data_invigilator, problem)
+
+
+def solve_ga(problem, data_exam, data_invigilator, config=None, rng=None, on_generation=None):
+    """Run the GA from a fresh population of ``config.population_size``."""
+    config = config or GAConfig()
+    rng = as_rng(rng)
+    population = initialize_population(None, None, None, population_size=config.population_size, problem=problem,
+                                       rng=rng)
+    return genetic_algorithm(population, data_exam, data_invigilator, problem=problem,
+                             on_generation=on_generation, config=config, rng=rng)
+
+
+def _fill_order(problem):
+    """Slots in the order the greedy solver fills them.
+
+    Ketua slots come first, as seniors are the scarcest staff; within each
+    group, exams of crowded sessions and Friday exams go first, as they have
+    the fewest free candidates.
+    """
+    session_slots = np.bincount(problem.slot_time_slot, minlength=problem.n_time_slots)
+    exam_order = np.lexsort((~problem.is_friday, -session_slots[problem.exam_time_slot]))
+    ketua = problem.slot_offsets[exam_order]
+    others = np.concatenate([
+        np.arange(problem.slot_offsets[exam_idx] + 1, problem.slot_offsets[exam_idx + 1]) for exam_idx in exam_order
+    ]).astype(np.int64)
+    return np.concatenate((ketua, others)).tolist()
+
+
+def construct(problem, rng=None):
+    """Greedy schedule: each slot, in ``_fill_order``, gets its least-penalty staff member."""
+    rng = as_rng(rng)
+    genome = Genome(problem, np.full(problem.n_slots, -1, dtype=np.int32), problem.venue_allocation.copy())
+    state = FitnessState(genome)
+    for slot in _fill_order(problem):
+        state.apply_move(slot, best_staff(state, slot, rng))
+    state.commit()
+    return genome
+
+
+def solve_greedy(problem, data_exam, data_invigilator, config=None, rng=None, on_generation=None):
+    """Greedy construction followed by ``repair`` for up to ``config.time_budget`` seconds."""
+    config = config or GAConfig()
+    rng = as_rng(rng)
+    genome = construct(problem, rng)
+    repair(genome, time_budget=config.time_budget, max_sweeps=50, rng=rng)
+    return _finish(genome, data_exam, data_invigilator, problem, on_generation)
+
+
+def _cp_model(problem):
+    """CP-SAT model of the fitness: ``(model, serve_index, lead_index)``.
+
+    ``serve_index[e, s]`` is the index of the variable true when staff ``s``
+    invigilates exam ``e``, and ``lead_index[e, s]`` of the one true when
+    they are its Ketua. Every exam gets exactly its required number of
+    invigilators, one of them the Ketua; each invigilator penalty of
+    ``penalty_terms`` is a term of the objective with the same weight. Venues are fixed by the problem's allocation, so the
+    hall-capacity penalty is a constant and left out.
+    """
+    from ortools.sat.python import cp_model
+
+    model = cp_model.CpModel()
+    n_staff = problem.n_staff
+    staff_range = range(n_staff)
+    is_senior = problem.is_senior.tolist()
+    is_male = problem.is_male.tolist()
+    required = problem.required_invigilators.tolist()
+
+    serves, leads, objective = [], [], []
+    for exam_idx in range(problem.n_exams):
+        serve = [model.NewBoolVar(f"serve_{exam_idx}_{staff_id}") for staff_id in staff_range]
+        lead = [model.NewBoolVar(f"lead_{exam_idx}_{staff_id}") for staff_id in staff_range]
+        model.Add(sum(serve) == max(required[exam_idx], 1))
+        model.AddExactlyOne(lead)
+        for staff_id in staff_range:
+            model.AddImplication(lead[staff_id], serve[staff_id])
+            if not is_senior[staff_id]:
+                objective.append(2 * lead[staff_id])
+            if problem.is_friday[exam_idx] and is_male[staff_id]:
+                objective.append(serve[staff_id])
+        for staff_id in problem.exam_lecturer_ids[exam_idx]:
+            objective.append(2 * serve[staff_id])
+        serves.append(serve)
+        leads.append(lead)
+
+    limits = problem.limits.tolist()
+    for staff_id in staff_range:
+        duties = [serves[exam_idx][staff_id] for exam_idx in range(problem.n_exams)]
+        over = model.NewIntVar(0, max(problem.n_exams - limits[staff_id], 0), f"over_{staff_id}")
+        model.Add(sum(duties) - limits[staff_id] <= over)
+        objective.append(over)
+
+    for time_slot, exam_indices in enumerate(problem.time_slot_exams):
+        if len(exam_indices) < 2:
+            continue
+        for staff_id in staff_range:
+            clash = model.NewIntVar(0, len(exam_indices) - 1, f"clash_{time_slot}_{staff_id}")
+            model.Add(sum(serves[exam_idx][staff_id] for exam_idx in exam_indices) <= 1 + clash)
+            objective.append(2 * clash)
+
+    model.Minimize(sum(objective))
+    serve_index = np.array([[var.Index() for var in serve] for serve in serves], dtype=np.int64)
+    lead_index = np.array([[var.Index() for var in lead] for lead in leads], dtype=np.int64)
+    return model, serve_index, lead_index
+
+
+def solve_cp_sat(problem, data_exam, data_invigilator, config=None, rng=None, on_generation=None):
+    """Minimize the fitness exactly with OR-Tools CP-SAT.
+
+    The repaired greedy schedule is the solver's hint, and is returned
+    instead whenever the solver finds nothing better. Model building counts
+    against ``config.time_budget`` seconds, or ``DEFAULT_CP_SAT_TIME``
+    without one; the result is then the best found rather than a proven
+    optimum.
+    """
+    try:
+        from ortools.sat.python import cp_model
+    except ImportError:
+        raise SolverUnavailable("The cp_sat engine needs OR-Tools: pip install ortools")
+
+    config = config or GAConfig()
+    rng = as_rng(rng)
+    start = time.perf_counter()
+    deadline = start + (config.time_budget or DEFAULT_CP_SAT_TIME)
+    hint = construct(problem, rng)
+    repair(hint, deadline=start + CP_SAT_HINT_SHARE * (deadline - start), max_sweeps=50, rng=rng)
+    hint_fitness = FitnessState(hint).fitness
+    if hint_fitness == problem.venue_penalty:
+        # Already optimal: moves cannot change the hall-capacity penalty
+        return _finish(hint, data_exam, data_invigilator, problem, on_generation)
+    model, serve_index, lead_index = _cp_model(problem)
+
+    # Hint every variable from the repaired schedule in one go
+    invigilators = hint.invigilators
+    assigned = invigilators >= 0
+    hint_serves = np.zeros(serve_index.shape, dtype=np.int64)
+    hint_serves[problem.slot_exam[assigned], invigilators[assigned]] = 1
+    hint_leads = np.zeros(lead_index.shape, dtype=np.int64)
+    ketuas = invigilators[problem.ketua_slots]
+    hint_leads[np.flatnonzero(ketuas >= 0), ketuas[ketuas >= 0]] = 1
+    solution_hint = model.Proto().solution_hint
+    solution_hint.vars.extend(np.concatenate((serve_index.ravel(), lead_index.ravel())).tolist())
+    solution_hint.values.extend(np.concatenate((hint_serves.ravel(), hint_leads.ravel())).tolist())
+
+    remaining = deadline - time.perf_counter()
+    if remaining <= 0:
+        return _finish(hint, data_exam, data_invigilator, problem, on_generation)
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = remaining
+    solver.parameters.random_seed = rng.randrange(2 ** 31)
+    status = solver.Solve(model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return _finish(hint, data_exam, data_invigilator, problem, on_generation)
+
+    # Read the whole solution at once, then walk only the staff each exam got
+    solution = np.array(solver.ResponseProto().solution, dtype=np.int64)
+    served = solution[serve_index] != 0
+    ketuas = solution[lead_index].argmax(axis=1).tolist()
+    genome = Genome(problem, np.full(problem.n_slots, -1, dtype=np.int32), hint.venue_genes.copy())
+    for exam_idx, ketua in enumerate(ketuas):
+        crew = [ketua] + [staff_id for staff_id in np.flatnonzero(served[exam_idx]).tolist() if staff_id != ketua]
+        for slot, staff_id in zip(range(problem.slot_offsets[exam_idx], problem.slot_offsets[exam_idx + 1]), crew):
+            genome.set_slot(slot, staff_id)
+    if FitnessState(genome).fitness > hint_fitness:
+        genome = hint
+    return _finish(genome, data_exam, data_invigilator, problem, on_generation)
+
+
+SOLVERS = {'ga': solve_ga, 'greedy': solve_greedy, 'cp_sat': solve_cp_sat}
+
+
+def solve(engine, problem, data_exam, data_invigilator, config=None, rng=None, on_generation=None):
+    """Run the engine named ``engine`` and return ``(best_schedule, best_fitness, best_violations)``."""
+    if engine not in SOLVERS:
+        raise ValueError(f"engine must be one of {', '.join(SOLVERS)}")
+    return SOLVERS[engine](problem, data_exam, data_invigilator, config=config, rng=rng,
+                           on_generation=on_generation)
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from benchmarks.synthetic import generate_dataset
+from input_loader import load_workbooks
+from problem_model import compile_problem
+
+PROTOTYPE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Prototype')
+
+
+@pytest.fixture(scope='session')
+def prototype_inputs():
+    """``(data_exam, data_invigilator, contoh_jadual)`` from the Prototype workbooks."""
+    return load_workbooks(os.path.join(PROTOTYPE, 'DATA EXAM.xlsx'), os.path.join(PROTOTYPE, 'DATA INVIGILATOR.xlsx'),
+                          os.path.join(PROTOTYPE, 'CONTOH JADUAL BARU.xlsx'))
+
+
+@pytest.fixture(scope='session')
+def prototype_problem(prototype_inputs):
+    return compile_problem(*prototype_inputs)
+
+
+@pytest.fixture(scope='session')
+def synthetic_inputs():
+    return generate_dataset(120, 80, seed=3)
+
+
+@pytest.fixture(scope='session')
+def synthetic_problem(synthetic_inputs):
+    return compile_problem(*synthetic_inputs)
@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+from atomic_files import atomic_write, atomic_write_bytes
+from input_loader import InputCache
+from result_store import ResultStore
+
+
+def test_atomic_write_replaces_file(tmp_path):
+    path = tmp_path / 'out.bin'
+    path.write_bytes(b'old')
+    atomic_write_bytes(str(path), b'new')
+    assert path.read_bytes() == b'new'
+    assert os.listdir(tmp_path) == ['out.bin']
+
+
+def test_failed_write_keeps_old_file_and_no_temp(tmp_path):
+    path = tmp_path / 'out.bin'
+    path.write_bytes(b'old')
+
+    def write(f):
+        f.write(b'partial')
+        raise RuntimeError('disk full')
+
+    with pytest.raises(RuntimeError):
+        atomic_write(str(path), write)
+    assert path.read_bytes() == b'old'
+    assert os.listdir(tmp_path) == ['out.bin']
+
+
+def test_stores_leave_no_temp_files(tmp_path, prototype_inputs):
+    store = ResultStore(str(tmp_path / 'results'))
+    result_id = store.save({'best_fitness': 3})
+    assert store.load(result_id)['best_fitness'] == 3
+
+    cache = InputCache(str(tmp_path / 'inputs'))
+    cache.put('key', prototype_inputs[0])
+    assert cache.get('key').equals(prototype_inputs[0])
+
+    for directory in ('results', 'inputs'):
+        assert not [name for name in os.listdir(tmp_path / directory) if name.endswith('.tmp')]
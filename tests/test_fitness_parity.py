@@ -0,0 +1,100 @@
+"""The vectorized scores must match the original per-exam loops."""
+import random
+
+import pytest
+
+from ga_model import calculate_fitness, check_constraints, evaluate_population, initialize_population, penalty_terms
+
+
+def _name(label):
+    return label.split('(')[0].strip().lower()
+
+
+def _reference_violations(schedule, data_invigilator):
+    """The original check_constraints loops over decoded exam dicts, plus the later time-clash rule."""
+    counts = dict.fromkeys(('Ketua Not Pensyarah Kanan', 'Lecturer Invigilating Own Exam',
+                            'Male Invigilator on Friday', 'Exceeded Invigilation Limit', 'Insufficient Invigilators',
+                            'Invigilator Time Clash'), 0)
+    pensyarah_kanan = set(
+        data_invigilator[data_invigilator['Jawatan'].str.contains('PENSYARAH KANAN', case=False, na=False)]['Nama']
+        .str.lower()
+    )
+    invigilation_count = {name.lower(): 0 for name in data_invigilator['Nama']}
+    booked = {}
+
+    for exam in schedule:
+        if _name(exam['Invigilators'][0]) not in pensyarah_kanan:
+            counts['Ketua Not Pensyarah Kanan'] += 2
+        lecturers = [lecturer.strip().lower() for lecturer in exam['Lecturer'].split(',')]
+        for invigilator in exam['Invigilators']:
+            if _name(invigilator) in lecturers:
+                counts['Lecturer Invigilating Own Exam'] += 2
+        if exam['Hari'].strip().lower() == 'jumaat':
+            for invigilator in exam['Invigilators']:
+                record = data_invigilator[data_invigilator['Nama'].str.lower() == _name(invigilator)]
+                if not record.empty and record['Jantina'].values[0].strip().lower() == 'male':
+                    counts['Male Invigilator on Friday'] += 1
+        if len(exam['Invigilators']) < (exam['Bilangan Pelajar'] + 29) // 30:
+            counts['Insufficient Invigilators'] += 2
+        for invigilator in exam['Invigilators']:
+            if _name(invigilator) in invigilation_count:
+                invigilation_count[_name(invigilator)] += 1
+            key = (exam['Tarikh'], exam['Masa'], _name(invigilator))
+            if key in booked:
+                counts['Invigilator Time Clash'] += 2
+            booked[key] = True
+
+    for name, count in invigilation_count.items():
+        role = data_invigilator[data_invigilator['Nama'].str.lower() == name]['Jawatan'].values[0].lower()
+        counts['Exceeded Invigilation Limit'] += max(count - (2 if 'pensyarah' in role else 1), 0)
+    return counts
+
+
+@pytest.fixture(scope='module')
+def scrambled_population(prototype_inputs, prototype_problem):
+    """Prototype schedules with random reassignments and emptied helper slots, so every rule fires."""
+    problem = prototype_problem
+    rng = random.Random(0)
+    population = initialize_population(*prototype_inputs, population_size=8, problem=problem, rng=0)
+    helper_slots = sorted(set(range(problem.n_slots)) - set(problem.ketua_slots.tolist()))
+    for idx, genome in enumerate(population):
+        for _ in range(idx * 15):
+            genome.set_slot(rng.randrange(problem.n_slots), rng.randrange(problem.n_staff))
+        for slot in rng.sample(helper_slots, idx):
+            genome.set_slot(slot, -1)
+    return population
+
+
+def test_fitness_matches_reference(prototype_inputs, prototype_problem, scrambled_population):
+    data_exam, data_invigilator, _ = prototype_inputs
+    expected = []
+    for genome in scrambled_population:
+        counts = _reference_violations(genome.decode(), data_invigilator)
+        counts.pop('Insufficient Invigilators')
+        expected.append(sum(counts.values()))
+
+    assert [calculate_fitness(genome, data_exam, data_invigilator, prototype_problem)
+            for genome in scrambled_population] == expected
+    assert evaluate_population(scrambled_population, prototype_problem).tolist() == expected
+    assert len(set(expected)) > 1
+
+
+def test_penalty_terms_match_reference(prototype_inputs, prototype_problem, scrambled_population):
+    _, data_invigilator, _ = prototype_inputs
+    for genome in scrambled_population:
+        counts = _reference_violations(genome.decode(), data_invigilator)
+        terms = dict(zip(('Ketua Not Pensyarah Kanan', 'Lecturer Invigilating Own Exam', 'Male Invigilator on Friday',
+                          'Exceeded Invigilation Limit', 'Invigilator Time Clash', 'Venue Over Capacity'),
+                         penalty_terms(genome.invigilators[None, :], prototype_problem)[0].tolist()))
+        assert terms.pop('Venue Over Capacity') == 0
+        counts.pop('Insufficient Invigilators')
+        assert terms == counts
+
+
+def test_check_constraints_matches_reference(prototype_inputs, prototype_problem, scrambled_population):
+    data_exam, data_invigilator, _ = prototype_inputs
+    for genome in scrambled_population:
+        violations = check_constraints(genome, data_exam, data_invigilator, prototype_problem)
+        assert violations.pop('Venue Over Capacity')['count'] == 0
+        assert {name: details['count'] for name, details in violations.items()} == \
+            _reference_violations(genome.decode(), data_invigilator)
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from fitness_state import FitnessState
+from ga_model import initialize_population, penalty_terms
+from problem_model import compile_problem
+from venues import Venue
+
+
+def _rescore(genome):
+    return int(penalty_terms(genome.invigilators[None, :], genome.problem, genome.venues[None, :]).sum())
+
+
+def _fuzz(problem, inputs, n_genomes=10, n_moves=500, seed=0):
+    rng = random.Random(seed)
+    population = initialize_population(*inputs, population_size=n_genomes, problem=problem, rng=seed)
+    for genome in population:
+        state = FitnessState(genome)
+        assert state.fitness == _rescore(genome)
+        for _ in range(n_moves):
+            slot = rng.randrange(problem.n_slots)
+            staff_id = rng.randrange(-1, problem.n_staff)
+            before = state.fitness
+            delta = state.move_delta(slot, staff_id)
+            assert state.apply_move(slot, staff_id) == delta
+            assert state.fitness == before + delta == _rescore(genome) == genome.fitness
+            if rng.random() < 0.3:
+                assert state.undo_move() == -delta
+                assert state.fitness == before == _rescore(genome)
+        state.commit()
+
+
+def test_moves_match_full_rescore(synthetic_inputs, synthetic_problem):
+    _fuzz(synthetic_problem, synthetic_inputs)
+
+
+def test_moves_match_full_rescore_prototype(prototype_inputs, prototype_problem):
+    _fuzz(prototype_problem, prototype_inputs, seed=1)
+
+
+def test_moves_match_full_rescore_tight_venues(prototype_inputs):
+    problem = compile_problem(*prototype_inputs, venues=(Venue('A', 120), Venue('B', 60, students_per_invigilator=20)))
+    genome = initialize_population(*prototype_inputs, population_size=1, problem=problem, rng=0)[0]
+    assert FitnessState(genome.copy()).venue_penalty > 0
+    _fuzz(problem, prototype_inputs, seed=2)
+
+
+@pytest.mark.parametrize('staff_id', [-1, 0])
+def test_undo_restores_genes(synthetic_problem, synthetic_inputs, staff_id):
+    genome = initialize_population(*synthetic_inputs, population_size=1, problem=synthetic_problem, rng=3)[0]
+    genes = genome.invigilators.copy()
+    state = FitnessState(genome)
+    state.apply_move(int(synthetic_problem.ketua_slots[0]), staff_id)
+    state.undo_move()
+    assert genome.invigilators.tolist() == genes.tolist()
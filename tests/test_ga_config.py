@@ -0,0 +1,30 @@
+import pytest
+
+from ga_config import GAConfig
+
+
+def test_small_population_caps_base_elite_count():
+    config = GAConfig.from_mapping({'population_size': '10'}, base=GAConfig(elite_size=20))
+    assert (config.population_size, config.elite_size) == (10, 10)
+    assert GAConfig.from_mapping({'population_size': '50'}).elite_size == 20
+
+
+def test_explicit_elite_size_is_still_checked():
+    with pytest.raises(ValueError):
+        GAConfig.from_mapping({'population_size': '10', 'elite_size': '15'})
+
+
+def test_invalid_values_are_rejected():
+    with pytest.raises(ValueError):
+        GAConfig.from_mapping({'mutation_rate': 'lots'})
+    with pytest.raises(ValueError):
+        GAConfig.from_mapping({'no_such_setting': '1'})
+
+
+def test_limits_reject_oversized_requests():
+    limits = {'population_size': 500, 'time_budget': 600}
+    assert GAConfig.from_mapping({'population_size': '500', 'time_budget': '600'}, limits=limits).time_budget == 600
+    with pytest.raises(ValueError, match='population_size must be at most 500'):
+        GAConfig.from_mapping({'population_size': '100000'}, limits=limits)
+    with pytest.raises(ValueError):
+        GAConfig.from_mapping({'time_budget': '1e9'}, limits=limits)
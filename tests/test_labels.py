@@ -0,0 +1,28 @@
+from dashboard_stats import build_aggregates
+from ga_model import initialize_population
+from replan import encode_schedule
+from timetable_export import duty_rows, format_schedule, split_invigilators, split_label
+
+
+def test_split_label():
+    assert split_label('AHMAD BIN ALI (K)') == ('AHMAD BIN ALI', 'Ketua')
+    assert split_label('SITI (S)') == ('SITI', 'Staff')
+    assert split_label('NO MARKER') == ('NO MARKER', '')
+
+
+def test_split_invigilators():
+    assert split_invigilators('A (K), B (L), ') == ['A (K)', 'B (L)']
+    assert split_invigilators(['A (K)', ' ']) == ['A (K)']
+    assert split_invigilators(None) == []
+
+
+def test_formatted_schedule_round_trips(prototype_inputs, prototype_problem):
+    genome = initialize_population(*prototype_inputs, population_size=1, problem=prototype_problem, rng=0)[0]
+    schedule = format_schedule(genome)
+
+    encoded, affected = encode_schedule(prototype_problem, schedule)
+    assert encoded.invigilators.tolist() == genome.invigilators.tolist()
+    assert not affected.any()
+
+    aggregates = build_aggregates(schedule, {})
+    assert aggregates['overview']['total_duties'] == len(duty_rows(schedule)) == int((genome.invigilators >= 0).sum())
@@ -0,0 +1,77 @@
+import random
+
+import numpy as np
+
+from ga_model import (calculate_fitness, create_new_generation, evaluate_population, initialize_population,
+                      reassign_mutation)
+from problem_model import CHUNK_SIZE, CowArray, population_nbytes
+
+
+def test_copy_shares_chunks_until_written():
+    values = np.arange(3 * CHUNK_SIZE + 5, dtype=np.int32)
+    original = CowArray.from_array(values)
+    copy = original.copy()
+    assert all(a is b for a, b in zip(original.chunks, copy.chunks))
+
+    copy[CHUNK_SIZE + 1] = -7
+    assert original[CHUNK_SIZE + 1] == CHUNK_SIZE + 1
+    assert copy.chunks[1] is not original.chunks[1]
+    assert all(copy.chunks[idx] is original.chunks[idx] for idx in (0, 2, 3))
+    np.testing.assert_array_equal(original.to_array(), values)
+
+
+def test_splice_shares_whole_chunks():
+    first = CowArray.from_array(np.zeros(4 * CHUNK_SIZE, dtype=np.int32))
+    second = CowArray.from_array(np.ones(4 * CHUNK_SIZE, dtype=np.int32))
+    cut = CHUNK_SIZE + 3
+    child = first.splice(second, cut)
+
+    expected = np.concatenate((np.zeros(cut), np.ones(4 * CHUNK_SIZE - cut)))
+    np.testing.assert_array_equal(child.to_array(), expected)
+    assert child.chunks[0] is first.chunks[0]
+    assert child.chunks[2] is second.chunks[2] and child.chunks[3] is second.chunks[3]
+
+    child[0] = 5
+    child[3 * CHUNK_SIZE] = 5
+    assert first[0] == 0 and second[3 * CHUNK_SIZE] == 1
+
+
+def test_mutated_child_leaves_elite_untouched(synthetic_inputs, synthetic_problem):
+    data_exam, data_invigilator, _ = synthetic_inputs
+    population = initialize_population(*synthetic_inputs, population_size=10, problem=synthetic_problem, rng=2)
+    rng = random.Random(1)
+    for schedule in population:
+        # Clashes for the repair step to fix
+        for _ in range(40):
+            schedule.set_slot(rng.randrange(synthetic_problem.n_slots), rng.randrange(synthetic_problem.n_staff))
+        schedule.fitness = None
+    evaluate_population(population, synthetic_problem)
+    elite = population[0]
+    genes, fitness = elite.invigilators.copy(), elite.fitness
+    previous = [(schedule.invigilators.copy(), schedule.fitness) for schedule in population]
+
+    child = reassign_mutation(elite.copy(), data_invigilator, mutation_rate=1.0, problem=synthetic_problem, rng=4)
+    assert child.invigilators.tolist() != genes.tolist()
+    assert child.fitness is None
+
+    new_population = create_new_generation(population, data_exam, data_invigilator, elite_size=3,
+                                           problem=synthetic_problem, mutation_rate=1.0, mutation='reassign',
+                                           repair_budget=5.0, repair_count=len(population), rng=4)
+    np.testing.assert_array_equal(elite.invigilators, genes)
+    assert elite.fitness == fitness
+    for schedule, (old_genes, old_fitness) in zip(population, previous):
+        np.testing.assert_array_equal(schedule.invigilators, old_genes)
+        assert schedule.fitness == old_fitness
+    for schedule in new_population:
+        if schedule.fitness is not None:
+            assert schedule.fitness == calculate_fitness(schedule, data_exam, data_invigilator, synthetic_problem)
+
+
+def test_population_shares_memory(synthetic_inputs, synthetic_problem):
+    data_exam, data_invigilator, _ = synthetic_inputs
+    population = initialize_population(*synthetic_inputs, population_size=20, problem=synthetic_problem, rng=2)
+    for _ in range(3):
+        population = create_new_generation(population, data_exam, data_invigilator, elite_size=5,
+                                           problem=synthetic_problem, mutation_rate=0.2, rng=6)
+    naive = sum(schedule.invigilators.nbytes + schedule.venues.nbytes for schedule in population)
+    assert population_nbytes(population) < 0.75 * naive
@@ -0,0 +1,50 @@
+import random
+
+import numpy as np
+import pytest
+
+from ga_model import create_new_generation, initialize_population
+from local_search import repair
+from seeding import as_rng
+
+
+def _genes(population):
+    return [(schedule.invigilators.tolist(), schedule.venues.tolist()) for schedule in population]
+
+
+def test_parallel_population_matches_serial(synthetic_inputs, synthetic_problem):
+    serial = initialize_population(*synthetic_inputs, population_size=24, problem=synthetic_problem, rng=7)
+    parallel = initialize_population(*synthetic_inputs, population_size=24, problem=synthetic_problem, rng=7,
+                                     max_workers=3)
+    assert _genes(parallel) == _genes(serial)
+
+    data_exam, data_invigilator, _ = synthetic_inputs
+    settings = {'problem': synthetic_problem, 'elite_size': 4, 'mutation_rate': 0.2, 'mutation': 'reassign'}
+    serial_children = create_new_generation(serial, data_exam, data_invigilator, rng=11, **settings)
+    parallel_children = create_new_generation(parallel, data_exam, data_invigilator, rng=11, **settings)
+    assert _genes(parallel_children) == _genes(serial_children)
+
+
+def test_same_seed_same_population(synthetic_inputs, synthetic_problem):
+    first = initialize_population(*synthetic_inputs, population_size=5, problem=synthetic_problem, rng=0)
+    second = initialize_population(*synthetic_inputs, population_size=5, problem=synthetic_problem, rng=0)
+    assert _genes(first) == _genes(second)
+
+
+def test_as_rng():
+    assert as_rng(None) is random
+    generator = random.Random(1)
+    assert as_rng(generator) is generator
+    assert as_rng(0).random() == random.Random(0).random()
+    assert isinstance(as_rng(np.random.default_rng(0)), random.Random)
+    with pytest.raises(TypeError):
+        as_rng('seed')
+
+
+@pytest.mark.parametrize('seed', [0, 5])
+def test_repair_accepts_int_seed(synthetic_inputs, synthetic_problem, seed):
+    population = initialize_population(*synthetic_inputs, population_size=2, problem=synthetic_problem, rng=1)
+    first, second = population[0].copy(), population[0].copy()
+    repair(first, max_sweeps=3, rng=seed)
+    repair(second, max_sweeps=3, rng=seed)
+    assert first.invigilators.tolist() == second.invigilators.tolist()
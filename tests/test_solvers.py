@@ -0,0 +1,28 @@
+import time
+
+import pytest
+
+from ga_config import GAConfig
+from ga_model import calculate_fitness
+from solvers import solve
+
+
+def test_greedy_scores_match_full_rescore(synthetic_inputs, synthetic_problem):
+    data_exam, data_invigilator, _ = synthetic_inputs
+    schedule, fitness, violations = solve('greedy', synthetic_problem, data_exam, data_invigilator,
+                                          config=GAConfig(time_budget=1.0), rng=1)
+    assert fitness == calculate_fitness(schedule, data_exam, data_invigilator, synthetic_problem)
+    assert set(violations) >= {'Invigilator Time Clash', 'Venue Over Capacity'}
+
+
+def test_cp_sat_never_worse_than_greedy_and_keeps_budget(synthetic_inputs, synthetic_problem):
+    pytest.importorskip('ortools')
+    data_exam, data_invigilator, _ = synthetic_inputs
+    config = GAConfig(time_budget=2.0)
+    _, greedy_fitness, _ = solve('greedy', synthetic_problem, data_exam, data_invigilator, config=config, rng=1)
+
+    start = time.perf_counter()
+    schedule, fitness, _ = solve('cp_sat', synthetic_problem, data_exam, data_invigilator, config=config, rng=1)
+    assert time.perf_counter() - start < config.time_budget + 0.5
+    assert fitness <= greedy_fitness
+    assert fitness == calculate_fitness(schedule, data_exam, data_invigilator, synthetic_problem)
@@ -0,0 +1,73 @@
+import json
+
+import numpy as np
+import pytest
+
+from ga_config import GAConfig
+from ga_model import genetic_algorithm, initialize_population
+from problem_model import compile_problem
+from venues import DEFAULT_VENUES, Venue, allocate_venues, load_venues, overfull_exams
+
+
+def test_allocate_venues_best_fit_decreasing():
+    venues = (Venue('BIG', 300), Venue('SMALL', 100))
+    # Slot 0, largest first: 250 takes BIG, 90 takes SMALL, 40 fits only BIG's remaining 50 seats
+    allocation = allocate_venues([90, 250, 40, 80], [0, 0, 0, 1], 2, venues)
+    assert allocation.tolist() == [1, 0, 0, 1]
+
+
+def test_allocate_venues_overflow_goes_to_emptiest_hall():
+    venues = (Venue('A', 100), Venue('B', 60))
+    allocation = allocate_venues([90, 80], [0, 0], 1, venues)
+    # 90 takes A; 80 fits nowhere and goes to B, which has the most free seats left
+    assert allocation.tolist() == [0, 1]
+
+
+def test_unsized_halls_take_overflow_least_occupied_first():
+    allocation = allocate_venues([50, 40, 30, 20], [0, 0, 0, 0], 1, DEFAULT_VENUES)
+    assert allocation.tolist() == [0, 1, 1, 0]
+
+    sized = (Venue('A', 50), Venue('OVERFLOW'))
+    assert allocate_venues([50, 40], [0, 0], 1, sized).tolist() == [0, 1]
+
+
+def test_overfull_exams_flags_every_exam_in_a_full_hall(prototype_inputs):
+    problem = compile_problem(*prototype_inputs, venues=(Venue('A', 100),))
+    venue_matrix = np.zeros((2, problem.n_exams), dtype=np.int64)
+    overfull = overfull_exams(problem, venue_matrix)
+
+    seats = np.bincount(problem.exam_time_slot, weights=problem.exam_students, minlength=problem.n_time_slots)
+    expected = seats[problem.exam_time_slot] > 100
+    assert expected.any() and not expected.all()
+    np.testing.assert_array_equal(overfull, np.vstack([expected, expected]))
+    assert problem.venue_penalty == 2 * int(expected.sum())
+
+
+def test_default_venues_are_never_over_capacity(prototype_problem):
+    assert prototype_problem.venue_penalty == 0
+    assert not overfull_exams(prototype_problem, prototype_problem.venue_allocation[None, :]).any()
+
+
+def test_ga_reaches_target_despite_fixed_venue_penalty(prototype_inputs):
+    data_exam, data_invigilator, _ = prototype_inputs
+    problem = compile_problem(*prototype_inputs, venues=(Venue('A', 100),))
+    assert problem.venue_penalty > 0
+    population = initialize_population(*prototype_inputs, population_size=20, problem=problem, rng=1)
+    generations = []
+    _, best_fitness, _ = genetic_algorithm(population, data_exam, data_invigilator, problem=problem,
+                                           config=GAConfig(population_size=20, elite_size=4, num_generations=40,
+                                                           patience=40),
+                                           on_generation=lambda generation, fitness: generations.append(generation),
+                                           rng=1)
+    assert best_fitness == problem.venue_penalty
+    assert len(generations) < 40
+
+
+def test_load_venues(tmp_path):
+    path = tmp_path / 'venues.json'
+    path.write_text(json.dumps([{'name': 'DEWAN AKADEMIK', 'capacity': 300}, {'name': 'BILIK 1'}]))
+    assert load_venues(str(path)) == (Venue('DEWAN AKADEMIK', 300), Venue('BILIK 1'))
+
+    path.write_text(json.dumps([{'name': 'A', 'capacity': 0}]))
+    with pytest.raises(ValueError):
+        load_venues(str(path))
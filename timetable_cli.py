@@ -0,0 +1,234 @@
+"""Generate timetables from the command line, without the web app.
+
+One input set is the three workbooks the upload form takes. Either name
+them directly::
+
+    python -m timetable_cli --exam "DATA EXAM.xlsx" --invigilator "DATA INVIGILATOR.xlsx" \\
+        --subjects "CONTOH JADUAL BARU.xlsx" --seed 1 --output out/
+
+or point ``--input-dir`` at a directory of input sets, one per
+subdirectory, to schedule them all concurrently::
+
+    python -m timetable_cli --input-dir faculties/ --jobs 4 --engine greedy --output out/
+
+Within a set, workbooks are told apart by name: 'INVIGILATOR', then
+'EXAM', and the remaining one is the subject information. Each set gets
+``<output>/<set name>/`` with ``timetable.xlsx`` (timetable plus duty
+sheets), ``violations.json`` and ``run.json`` timing stats. Parsed inputs
+are cached under ``--cache-dir`` the same way as for uploads.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ga_config import GAConfig
+from ga_model import initialize_population
+from input_loader import InputCache, load_workbooks
+from multi_start import multi_start
+from parallel_ga import parallel_genetic_algorithm
+from problem_model import compile_problem
+from seeding import as_rng
+from solvers import SOLVERS, solve
+from timetable_export import format_schedule, write_xlsx
+from venues import DEFAULT_VENUES, load_venues
+
+WORKBOOK_SUFFIXES = ('.xlsx', '.xls')
+DEFAULT_CACHE_DIR = os.path.join('uploads', 'inputs')
+
+
+def classify_workbooks(paths):
+    """``(exam, invigilator, subjects)`` paths of one input set, told apart by file name."""
+    invigilator = [path for path in paths if 'INVIGILATOR' in os.path.basename(path).upper()]
+    exam = [path for path in paths if 'EXAM' in os.path.basename(path).upper() and path not in invigilator]
+    subjects = [path for path in paths if path not in invigilator and path not in exam]
+    if len(invigilator) != 1 or len(exam) != 1 or len(subjects) != 1:
+        raise ValueError("expected one exam, one invigilator and one subject information workbook, found: "
+                         + ', '.join(os.path.basename(path) for path in paths))
+    return exam[0], invigilator[0], subjects[0]
+
+
+def find_input_sets(directory):
+    """``(name, workbook paths)`` for the directory and each subdirectory that holds workbooks."""
+    def workbooks(folder):
+        return sorted(os.path.join(folder, name) for name in os.listdir(folder)
+                      if name.lower().endswith(WORKBOOK_SUFFIXES) and not name.startswith('~$'))
+
+    folders = [(os.path.basename(os.path.abspath(directory)), directory)]
+    folders += [(entry.name, entry.path) for entry in sorted(os.scandir(directory), key=lambda e: e.name)
+                if entry.is_dir()]
+    sets = [(name, workbooks(folder)) for name, folder in folders]
+    return [(name, paths) for name, paths in sets if paths]
+
+
+def _solve(problem, data_exam, data_invigilator, contoh_jadual, options):
+    """``(best_schedule, best_fitness, violations, extra stats)`` with the requested engine and parallelism."""
+    config = options['config']
+    if options['restarts'] > 1:
+        best_schedule, best_fitness, violations, summary = multi_start(
+            data_exam, data_invigilator, contoh_jadual, problem=problem, restarts=options['restarts'],
+            config=config, rng=options['seed'], engine=options['engine'], max_workers=options['workers'],
+            time_budget=config.time_budget
+        )
+        summary.pop('runs')
+        return best_schedule, best_fitness, violations, {'restarts': summary}
+
+    if options['engine'] == 'ga' and options['workers'] > 1:
+        rng = as_rng(options['seed'])
+        population = initialize_population(data_exam, data_invigilator, contoh_jadual, config.population_size,
+                                           problem=problem, max_workers=options['workers'], rng=rng)
+        best_schedule, best_fitness, violations = parallel_genetic_algorithm(
+            population, data_exam, data_invigilator, problem=problem, num_islands=options['workers'],
+            max_workers=options['workers'], config=config, rng=rng
+        )
+        return best_schedule, best_fitness, violations, {}
+
+    best_schedule, best_fitness, violations = solve(options['engine'], problem, data_exam, data_invigilator,
+                                                    config=config, rng=options['seed'])
+    return best_schedule, best_fitness, violations, {}
+
+
+def run_input_set(name, paths, output_dir, options):
+    """Schedule one input set and write its outputs; returns its timing stats.
+
+    Errors are reported in the stats rather than raised, so one bad set
+    does not stop a batch.
+    """
+    stats = {'name': name, 'engine': options['engine'], 'seed': options['seed']}
+    start = time.perf_counter()
+    try:
+        cache = InputCache(options['cache_dir']) if options['cache_dir'] else None
+        data_exam, data_invigilator, contoh_jadual = load_workbooks(*classify_workbooks(paths), cache=cache)
+        stats['load_seconds'] = time.perf_counter() - start
+
+        mark = time.perf_counter()
+        problem = compile_problem(data_exam, data_invigilator, contoh_jadual, options['venues'])
+        stats['compile_seconds'] = time.perf_counter() - mark
+        stats.update(n_exams=problem.n_exams, n_staff=problem.n_staff, n_slots=problem.n_slots)
+
+        mark = time.perf_counter()
+        best_schedule, best_fitness, violations, extra = _solve(problem, data_exam, data_invigilator,
+                                                                contoh_jadual, options)
+        stats['solve_seconds'] = time.perf_counter() - mark
+        stats.update(extra)
+        if best_schedule is None:
+            raise RuntimeError("no timetable was produced within the time budget")
+        stats['fitness'] = best_fitness
+
+        mark = time.perf_counter()
+        set_dir = os.path.join(output_dir, name)
+        os.makedirs(set_dir, exist_ok=True)
+        with open(os.path.join(set_dir, 'timetable.xlsx'), 'wb') as f:
+            write_xlsx(format_schedule(best_schedule), f, duties=True)
+        with open(os.path.join(set_dir, 'violations.json'), 'w') as f:
+            json.dump({'fitness': best_fitness, 'violations': violations}, f, indent=2, default=str)
+        stats['write_seconds'] = time.perf_counter() - mark
+        stats['violations'] = {constraint: details['count'] for constraint, details in violations.items()}
+    except Exception as e:
+        stats['error'] = f"{type(e).__name__}: {e}"
+    stats['total_seconds'] = time.perf_counter() - start
+
+    if 'error' not in stats:
+        with open(os.path.join(output_dir, name, 'run.json'), 'w') as f:
+            json.dump(stats, f, indent=2)
+    return stats
+
+
+def run_batch(input_sets, output_dir, options, jobs=1, on_done=None):
+    """Run every ``(name, paths)`` input set, ``jobs`` at a time; returns their stats in input order."""
+    os.makedirs(output_dir, exist_ok=True)
+    if jobs <= 1 or len(input_sets) <= 1:
+        results = []
+        for name, paths in input_sets:
+            results.append(run_input_set(name, paths, output_dir, options))
+            if on_done is not None:
+                on_done(results[-1])
+        return results
+
+    order = {name: idx for idx, (name, _) in enumerate(input_sets)}
+    results = []
+    with ProcessPoolExecutor(max_workers=min(jobs, len(input_sets))) as pool:
+        futures = [pool.submit(run_input_set, name, paths, output_dir, options) for name, paths in input_sets]
+        for future in as_completed(futures):
+            results.append(future.result())
+            if on_done is not None:
+                on_done(results[-1])
+    return sorted(results, key=lambda stats: order[stats['name']])
+
+
+def _print_stats(stats):
+    if 'error' in stats:
+        print(f"{stats['name']}: FAILED ({stats['error']})")
+        return
+    print(f"{stats['name']}: fitness {stats['fitness']}, {stats['n_exams']} exams x {stats['n_staff']} staff, "
+          f"load {stats['load_seconds']:.2f}s, compile {stats['compile_seconds']:.2f}s, "
+          f"solve {stats['solve_seconds']:.2f}s, write {stats['write_seconds']:.2f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    inputs = parser.add_argument_group('inputs')
+    inputs.add_argument('--input-dir', help="directory of input sets, one per subdirectory")
+    inputs.add_argument('--exam', help="DATA EXAM workbook")
+    inputs.add_argument('--invigilator', help="DATA INVIGILATOR workbook")
+    inputs.add_argument('--subjects', help="subject information (CONTOH JADUAL) workbook")
+    inputs.add_argument('--name', default='timetable', help="output folder name for a single input set")
+    inputs.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help="parsed-input cache shared with the web app; '' disables it")
+    inputs.add_argument('--venues', help="JSON venue table with hall capacities (see venues.load_venues)")
+    solver = parser.add_argument_group('solver')
+    solver.add_argument('--engine', choices=sorted(SOLVERS), default='ga')
+    solver.add_argument('--seed', type=int, help="random seed; each input set uses the same seed")
+    solver.add_argument('--population', type=int, default=100)
+    solver.add_argument('--generations', type=int, default=30)
+    solver.add_argument('--patience', type=int, default=10)
+    solver.add_argument('--time-budget', type=float, help="seconds per input set")
+    solver.add_argument('--repair-budget', type=float, default=0.1, help="local-search seconds per generation")
+    solver.add_argument('--restarts', type=int, default=1, help="best-of-N seeded restarts per input set")
+    solver.add_argument('--workers', type=int, default=1,
+                        help="processes per input set: GA islands, or concurrent restarts")
+    parser.add_argument('--jobs', type=int, default=1, help="input sets scheduled concurrently")
+    parser.add_argument('--output', default='timetables', help="output directory")
+    args = parser.parse_args(argv)
+
+    if args.input_dir:
+        input_sets = find_input_sets(args.input_dir)
+        if not input_sets:
+            parser.error(f"no workbooks found in {args.input_dir}")
+    elif args.exam and args.invigilator and args.subjects:
+        input_sets = [(args.name, [args.exam, args.invigilator, args.subjects])]
+    else:
+        parser.error("give --input-dir, or all of --exam, --invigilator and --subjects")
+
+    try:
+        config = GAConfig(population_size=args.population, elite_size=min(20, args.population),
+                          num_generations=args.generations, patience=args.patience, time_budget=args.time_budget,
+                          repair_budget=args.repair_budget)
+        venues = load_venues(args.venues) if args.venues else DEFAULT_VENUES
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    options = {
+        'config': config,
+        'engine': args.engine,
+        'seed': args.seed,
+        'restarts': args.restarts,
+        'workers': args.workers,
+        'cache_dir': args.cache_dir,
+        'venues': venues,
+    }
+
+    start = time.perf_counter()
+    results = run_batch(input_sets, args.output, options, jobs=args.jobs, on_done=_print_stats)
+    wall_seconds = time.perf_counter() - start
+
+    finished = [stats for stats in results if 'error' not in stats]
+    solve_seconds = sum(stats['solve_seconds'] for stats in finished)
+    print(f"{len(finished)} of {len(results)} input sets scheduled in {wall_seconds:.2f}s "
+          f"(solve time {solve_seconds:.2f}s in total); outputs in {args.output}")
+    return 0 if len(finished) == len(results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""Timetable downloads written straight from a stored result.
+
+Rows are streamed from the ``format_schedule`` dicts kept in the result
+store, never through a DataFrame. Excel files are written with
+xlsxwriter's ``constant_memory`` mode into an anonymous temporary file,
+with column widths measured while the rows go out; CSV is produced as a
+generator of lines; Parquet is written in row batches through pyarrow,
+which is optional.
+"""
+import csv
+import io
+import tempfile
+from datetime import datetime
+from itertools import chain
+
+import pandas as pd
+
+COLUMNS = ['Date', 'Time', 'Day', 'Course Code', 'Venue', 'Lecturer(s)', 'Number of Students', 'Invigilator(s)']
+DUTY_COLUMNS = ['Invigilator', 'Role', 'Date', 'Day', 'Time', 'Course Code', 'Venue']
+SUMMARY_COLUMNS = ['Invigilator', 'Role', 'Duties', 'Dates']
+ROLES = {'K': 'Ketua', 'L': 'Lecturer', 'S': 'Staff'}
+FORMATS = ('xlsx', 'csv', 'parquet')
+
+MIMETYPES = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+HEADER_FORMAT = {
+    'bold': True,
+    'bg_color': '#3498db',
+    'font_color': 'white',
+    'border': 1,
+    'align': 'center',
+    'valign': 'vcenter'
+}
+
+# Rows per Parquet row group
+PARQUET_BATCH = 4096
+
+
+class ExportUnavailable(RuntimeError):
+    """The requested format needs a package that is not installed."""
+
+
+def _date_text(value):
+    try:
+        return datetime.fromisoformat(str(value)).strftime('%Y-%m-%d')
+    except ValueError:
+        return value
+
+
+def timetable_rows(schedule):
+    """One list per exam, in ``COLUMNS`` order."""
+    for exam in schedule:
+        row = [exam.get(column, '') for column in COLUMNS]
+        row[0] = _date_text(row[0])
+        yield row
+
+
+def format_schedule(schedule):
+    """Decode the best genome and format it for display."""
+    if hasattr(schedule, 'decode'):
+        schedule = schedule.decode()
+    return [
+        {
+            "Course Code": exam['Kod Kursus'],
+            "Date": exam['Tarikh'].strftime('%Y-%m-%d') if isinstance(exam['Tarikh'], pd.Timestamp) else exam['Tarikh'],
+            "Day": exam['Hari'],
+            "Time": exam['Masa'],
+            "Venue": exam['Tempat'],
+            "Lecturer(s)": exam['Lecturer'],
+            "Invigilator(s)": (', '.join(exam['Invigilators']) if isinstance(exam['Invigilators'], list)
+                               else exam['Invigilators']),
+            "Number of Students": exam['Bilangan Pelajar']
+        }
+        for exam in schedule
+    ]
+
+
+def split_label(label):
+    """``('name', 'Ketua')`` for an invigilator label such as 'name (K)'."""
+    name, _, marker = label.rpartition(' (')
+    if not name or not marker.endswith(')'):
+        return label, ''
+    return name, ROLES.get(marker[:-1], marker[:-1])
+
+
+def split_invigilators(value):
+    """Invigilator labels of one exam, from the stored comma-separated string or a list."""
+    labels = value.split(', ') if isinstance(value, str) else value or []
+    return [label.strip() for label in labels if label.strip()]
+
+
+def duty_rows(schedule):
+    """One list per invigilator duty, in ``DUTY_COLUMNS`` order, grouped by invigilator."""
+    duties = []
+    for exam in schedule:
+        date = _date_text(exam.get('Date', ''))
+        for label in split_invigilators(exam.get('Invigilator(s)')):
+            name, role = split_label(label)
+            duties.append([name, role, date, exam.get('Day', ''), exam.get('Time', ''), exam.get('Course Code', ''),
+                           exam.get('Venue', '')])
+    duties.sort(key=lambda duty: (duty[0].lower(), str(duty[2]), str(duty[4])))
+    return duties
+
+
+def summary_rows(duties):
+    """One list per invigilator, in ``SUMMARY_COLUMNS`` order, from sorted ``duty_rows``."""
+    rows = []
+    for name, role, date, *_ in duties:
+        if rows and rows[-1][0] == name:
+            summary = rows[-1]
+            if role and role not in summary[1].split(', '):
+                summary[1] = ', '.join(filter(None, (summary[1], role)))
+            summary[2] += 1
+            if str(date) not in summary[3].split(', '):
+                summary[3] += f", {date}"
+        else:
+            rows.append([name, role, 1, str(date)])
+    return rows
+
+
+def _write_sheet(workbook, name, columns, rows, header_format):
+    """Write a header and rows in order, sizing columns to their longest value as it goes."""
+    worksheet = workbook.add_worksheet(name)
+    widths = [len(column) for column in columns]
+    for col_num, column in enumerate(columns):
+        worksheet.write(0, col_num, column, header_format)
+    for row_num, row in enumerate(rows, start=1):
+        for col_num, value in enumerate(row):
+            # Explicit types: uploaded text starting with '=' must not become a formula
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                worksheet.write_number(row_num, col_num, value)
+            else:
+                value = '' if value is None else str(value)
+                worksheet.write_string(row_num, col_num, value)
+            widths[col_num] = max(widths[col_num], len(str(value)))
+    for col_num, width in enumerate(widths):
+        worksheet.set_column(col_num, col_num, width + 2)
+    worksheet.freeze_panes(1, 0)
+
+
+def write_xlsx(schedule, output, duties=False):
+    """Write the timetable workbook, plus invigilator duty sheets if ``duties``, to ``output``."""
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    header_format = workbook.add_format(HEADER_FORMAT)
+    _write_sheet(workbook, 'Timetable', COLUMNS, timetable_rows(schedule), header_format)
+    if duties:
+        rows = duty_rows(schedule)
+        _write_sheet(workbook, 'Invigilator Duties', DUTY_COLUMNS, rows, header_format)
+        _write_sheet(workbook, 'Duty Summary', SUMMARY_COLUMNS, summary_rows(rows), header_format)
+    workbook.close()
+
+
+def iter_csv(schedule, duties=False):
+    """CSV text of the timetable, or of the duty list if ``duties``, one line at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    columns, rows = (DUTY_COLUMNS, duty_rows(schedule)) if duties else (COLUMNS, timetable_rows(schedule))
+    for row in chain([columns], rows):
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def write_parquet(schedule, output, duties=False):
+    """Write the timetable, or the duty list if ``duties``, to ``output`` as Parquet."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportUnavailable("Parquet export needs pyarrow: pip install pyarrow")
+
+    columns, rows = (DUTY_COLUMNS, duty_rows(schedule)) if duties else (COLUMNS, timetable_rows(schedule))
+    schema = pa.schema([
+        (column, pa.int64() if column == 'Number of Students' else pa.string()) for column in columns
+    ])
+
+    def batch(chunk):
+        arrays = []
+        for col_num, field in enumerate(schema):
+            values = [row[col_num] for row in chunk]
+            if field.type == pa.int64():
+                values = [int(value) if str(value).strip().lstrip('-').isdigit() else None for value in values]
+            else:
+                values = [None if value is None else str(value) for value in values]
+            arrays.append(pa.array(values, type=field.type))
+        return pa.record_batch(arrays, schema=schema)
+
+    with pq.ParquetWriter(output, schema) as writer:
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == PARQUET_BATCH:
+                writer.write_batch(batch(chunk))
+                chunk = []
+        if chunk:
+            writer.write_batch(batch(chunk))
+
+
+def export_file(schedule, fmt='xlsx', duties=False):
+    """Binary export of a stored timetable as an open temporary file, rewound to the start."""
+    writers = {'xlsx': write_xlsx, 'parquet': write_parquet}
+    if fmt not in writers:
+        raise ValueError(f"format must be one of {', '.join(writers)}")
+    output = tempfile.TemporaryFile()
+    try:
+        writers[fmt](schedule, output, duties=duties)
+    except Exception:
+        output.close()
+        raise
+    output.seek(0)
+    return output
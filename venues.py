@@ -0,0 +1,116 @@
+"""Exam halls, their capacities and the allocation of exams to them.
+
+Several exams of one date and session can share a hall as long as their
+students fit. ``allocate_venues`` places each session's exams by student
+count, largest first, into the hall whose free seats fit them most
+tightly (best-fit decreasing), so big halls stay free for big exams. An
+exam that fits nowhere goes to the hall with the most free seats and is
+scored as 'Venue Over Capacity'. A hall without a ``capacity`` is never
+full; such halls take the exams no sized hall fits, least occupied first.
+
+The venue table is configurable: ``load_venues`` reads a JSON list such as
+``[{"name": "DEWAN AKADEMIK", "capacity": 300, "students_per_invigilator": 30}]``.
+Until one is configured, ``DEFAULT_VENUES`` names the two halls without
+seat counts, so no exam is scored as over capacity.
+"""
+import json
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Venue:
+    """One exam hall: seats, and how many invigilators its exams need."""
+
+    name: str
+    capacity: Optional[int] = None
+    students_per_invigilator: int = 30
+    min_invigilators: int = 1
+
+    def __post_init__(self):
+        if not str(self.name).strip():
+            raise ValueError("venue name must not be empty")
+        for name in ('capacity', 'students_per_invigilator', 'min_invigilators'):
+            if getattr(self, name) is not None and getattr(self, name) < 1:
+                raise ValueError(f"{name} of {self.name} must be at least 1")
+
+    def invigilators_for(self, students):
+        """Invigilators for an exam of ``students`` seated here, the Ketua included."""
+        return max(self.min_invigilators, -(-int(students) // self.students_per_invigilator))
+
+
+# Seat counts unknown until the faculty's own table is configured
+DEFAULT_VENUES = (
+    Venue('DEWAN AKADEMIK'),
+    Venue('DEWAN LESTARI'),
+)
+
+
+def load_venues(path):
+    """Venue table from a JSON file holding a list of ``Venue`` fields per hall."""
+    with open(path) as f:
+        entries = json.load(f)
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path} must hold a non-empty list of venues")
+    try:
+        venues = tuple(Venue(**entry) for entry in entries)
+    except TypeError as e:
+        raise ValueError(f"Invalid venue in {path}: {e}")
+    if len({venue.name for venue in venues}) != len(venues):
+        raise ValueError(f"Duplicate venue names in {path}")
+    return venues
+
+
+class Occupancy:
+    """Students seated per (time slot, venue), with each hall's free seats."""
+
+    def __init__(self, n_time_slots, venues):
+        self.capacity = [venue.capacity for venue in venues]
+        self.seats = [[0] * len(venues) for _ in range(n_time_slots)]
+
+    def free(self, time_slot):
+        """Free seats per hall, None for a hall without a capacity."""
+        return [None if capacity is None else capacity - seats
+                for capacity, seats in zip(self.capacity, self.seats[time_slot])]
+
+    def add(self, time_slot, venue_id, students):
+        self.seats[time_slot][venue_id] += students
+
+    def best_fit(self, time_slot, students):
+        """The hall with the fewest free seats that still fits ``students``, else the emptiest."""
+        free = self.free(time_slot)
+        fits = [venue_id for venue_id, seats in enumerate(free) if seats is not None and seats >= students]
+        if fits:
+            return min(fits, key=free.__getitem__)
+        unsized = [venue_id for venue_id, seats in enumerate(free) if seats is None]
+        if unsized:
+            return min(unsized, key=self.seats[time_slot].__getitem__)
+        return max(range(len(free)), key=free.__getitem__)
+
+
+def allocate_venues(students, exam_time_slot, n_time_slots, venues):
+    """Venue index per exam, packing each time slot's exams best-fit decreasing."""
+    students = np.asarray(students, dtype=np.int64)
+    exam_time_slot = np.asarray(exam_time_slot, dtype=np.int64)
+    allocation = np.zeros(len(students), dtype=np.int16)
+    occupancy = Occupancy(n_time_slots, venues)
+    for exam_idx in np.lexsort((-students, exam_time_slot)).tolist():
+        time_slot, seats = int(exam_time_slot[exam_idx]), int(students[exam_idx])
+        venue_id = occupancy.best_fit(time_slot, seats)
+        occupancy.add(time_slot, venue_id, seats)
+        allocation[exam_idx] = venue_id
+    return allocation
+
+
+def overfull_exams(problem, venue_matrix):
+    """Bool matrix marking, per individual, exams seated in a hall over capacity that session."""
+    venue_matrix = np.asarray(venue_matrix, dtype=np.int64)
+    population_size = venue_matrix.shape[0]
+    n_keys = problem.n_time_slots * problem.n_venues
+    keys = problem.exam_time_slot * problem.n_venues + venue_matrix + np.arange(population_size)[:, None] * n_keys
+    seats = np.bincount(keys.ravel(), weights=np.broadcast_to(problem.exam_students, keys.shape).ravel(),
+                        minlength=population_size * n_keys)
+    over = seats > np.tile(problem.venue_capacity, population_size * problem.n_time_slots)
+    return over[keys]